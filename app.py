@@ -3,51 +3,27 @@ import os
 import streamlit as st
 import pandas as pd
 import streamlit.components.v1 as components
-from src.prompt_router import route_prompt
-from src.analyzer import adult_analysis, youth_analysis, total_analysis
+from src.prompt_router import IntentRouter, LOCAL_CONFIDENCE
+from src.analyzer import adult_analysis, youth_analysis, total_analysis, AGE_VALUE_COLS
 from src.visualizer import generate_graph
+from src.loader import load_frame, dataset_fingerprint, DATA_FILES
+from src.rollup import RollupCube
+from src.approx import StratifiedSample
+from src.result_cache import ResultCache
+from src.filter_index import FilterIndex
+from src.pipeline import submit, guess_dataset, single_flight
+from src.ingest import IngestionManager, READY, FAILED
+from src.tracing import Trace, span
 # 🔥 GEMINI (NEW SDK)
 from src.ai.gemini_parser import gemini_parse_prompt
 from src.ai.gemini_insight import generate_ai_insight
+from src.ai.schema import query_filters
 
-DATA_FILES = {
-    "default": "data/input/aadhar_clean.csv",
-    "biometric": "data/input/aadhar_biom.csv",
-    "enrolment": "data/input/aadhar_enroll.csv"
-}
-
-# ======================================================
-# STATE NAME STANDARDIZATION
-# ======================================================
-STATE_FIX_MAP = {
-    "west bengal": "West Bengal",
-    "west bangal": "West Bengal",
-    "west bengli": "West Bengal",
-    "westbengal": "West Bengal",
-    "west bengal ": "West Bengal",
-    
-    "andhra pradesh": "Andhra Pradesh",
-    "andhrapradesh": "Andhra Pradesh",
-
-    "odisha": "Odisha",
-    "orissa": "Odisha",
-
-    "chhattisgarh": "Chhattisgarh",
-    "chattisgarh": "Chhattisgarh",
-    "chhatishgarh": "Chhattisgarh",
-    "chhatisgarh": "Chhattisgarh",
-    "chatisgarh": "Chhattisgarh"
-}
-
-def clean_state_name(state):
-    if not isinstance(state, str):
-        return state
-    key = state.strip().lower()
-    return STATE_FIX_MAP.get(key, state.strip().title())
-
-
-
-
+# Datasets are shared by all sessions (st.cache_resource); copy-on-write
+# keeps any per-session derivation from writing into the shared frame.
+# Already the default from pandas 3.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 # ======================================================
 # PAGE CONFIG
@@ -94,20 +70,113 @@ st.divider()
 # ======================================================
 DATA_PATH = "data/input/aadhar_clean.csv"
 
-@st.cache_data
+# share of each state's rows kept for fast (approximate) mode
+APPROX_FRACTION = 0.02
+
+# analysis results kept across reruns and sessions
+RESULT_CACHE_SIZE = 256
+
+@st.cache_resource
+def get_ingestion():
+    # Converts all DATA_FILES in parallel worker processes at startup
+    return IngestionManager(DATA_FILES).start()
+
 def load_data(path):
-    df = pd.read_csv(path)
-    df.columns = df.columns.str.strip()
+    # One read-only, dictionary-encoded copy per dataset shared by every
+    # session (categorical state/district, int32 pincode, narrow ints);
+    # it lives in the filter index, already sorted by state/district/pincode
+    return load_filter_index(path).frame
+
+@st.cache_resource
+def load_cube(path):
+    # Pre-aggregated pincode/district/state sums, built once per dataset
+    return RollupCube.from_frame(load_data(path))
+
+@st.cache_resource
+def load_filter_index(path):
+    # Columnar cache: parsed + state-cleaned once, memory-mapped afterwards.
+    # cache_resource hands every session the same object; cache_data
+    # would unpickle a private copy of the whole frame on each call.
+    get_ingestion().wait_path(path)
+    return FilterIndex(load_frame(path))
+
+@st.cache_resource
+def load_sample(path):
+    # Fast mode: stratified row sample for top-N estimates
+    return StratifiedSample(load_data(path), fraction=APPROX_FRACTION)
+
+@st.cache_resource
+def get_result_cache():
+    # LRU of top-N results keyed on dataset fingerprint + intent + filters
+    return ResultCache(max_entries=RESULT_CACHE_SIZE)
+
+@st.cache_resource
+def _seen_fingerprints():
+    return {}
+
+def dataset_version(path):
+    # Drops every derived resource once the source CSV changes on disk
+    try:
+        fingerprint = dataset_fingerprint(path)
+    except OSError:
+        return None
+
+    seen = _seen_fingerprints()
+    if seen.setdefault(path, fingerprint) != fingerprint:
+        seen[path] = fingerprint
+        for loader in (load_filter_index, load_cube, load_sample, load_router):
+            loader.clear()
+    return fingerprint
+
+def warm_dataset(path):
+    load_filter_index(path)
+    load_cube(path)
+    load_sample(path)
+
+@st.cache_resource
+def load_router(path):
+    # Trie over the dataset's state/district names + known aliases
+    index = load_filter_index(path)
+    return IntentRouter(index.states, index.all_districts)
+
+def run_analysis(path, level, age_group, top_n, ascending, states, districts, pincodes):
+    cube_df = load_cube(path).select(
+        level,
+        states=list(states),
+        districts=list(districts),
+        pincodes=list(pincodes)
+    )
 
-    # 🔥 FIX STATE NAMES HERE
-    df["state"] = df["state"].apply(clean_state_name)
+    if age_group == "adult":
+        result_df = adult_analysis(cube_df, level, top_n, ascending)
+    elif age_group == "youth":
+        result_df = youth_analysis(cube_df, level, top_n, ascending)
+    else:
+        result_df = total_analysis(cube_df, level, top_n, ascending)
+    return result_df, len(cube_df)
 
-    df["Total_Aadhaar"] = df["demo_age_5_17"] + df["demo_age_17_"]
+def parse_query(user_query):
+    # Templated queries are answered locally; Gemini only when unsure
+    with span("local_parse") as record:
+        parsed, confidence = load_router(DATA_PATH).parse(user_query)
+        record["confidence"] = round(confidence, 3)
+    if confidence >= LOCAL_CONFIDENCE:
+        return parsed, "local"
 
-    return df
+    try:
+        return gemini_parse_prompt(user_query), "gemini"
+    except Exception:
+        return parsed, "fallback"
 
+dataset_version(DATA_PATH)
 df = load_data(DATA_PATH)
 
+STATUS_ICONS = {READY: "✅", FAILED: "⚠️"}
+st.caption(" · ".join(
+    f"{key} {STATUS_ICONS.get(info['state'], '⏳')}"
+    for key, info in get_ingestion().status().items()
+))
+
 # ======================================================
 # FILTERS
 # ======================================================
@@ -115,28 +184,26 @@ st.markdown("### 🔍 Search & Filters")
 
 f1, f2, f3, f4 = st.columns(4)
 
+filter_index = load_filter_index(DATA_PATH)
+
 with f1:
     selected_states = st.multiselect(
         "State",
-        sorted(df["state"].unique()),
+        filter_index.states,
         placeholder="Search state"
     )
 
-district_df = df[df["state"].isin(selected_states)] if selected_states else df
-
 with f2:
     selected_districts = st.multiselect(
         "District",
-        sorted(district_df["district"].unique()),
+        filter_index.districts(selected_states),
         placeholder="Search district"
     )
 
-pin_df = district_df[district_df["district"].isin(selected_districts)] if selected_districts else district_df
-
 with f3:
     selected_pincodes = st.multiselect(
         "Pincode",
-        sorted(pin_df["pincode"].astype(str).unique()),
+        filter_index.pincodes(selected_states, selected_districts),
         placeholder="Search pincode"
     )
 
@@ -163,92 +230,155 @@ user_query = st.text_input(
     label_visibility="collapsed"
 )
 
+approx_mode = st.toggle(
+    "⚡ Fast mode",
+    help="Shows a sampled top-N estimate first, exact numbers replace it when ready"
+)
+
+# Debug panel: open the app with ?debug=1
+DEBUG = st.query_params.get("debug") == "1"
+PROFILERS = {"Off": False, "cProfile": "cprofile", "pyinstrument": "pyinstrument"}
+profile_query = False
+if DEBUG:
+    # pyinstrument is optional (pip install pyinstrument); cProfile is used without it
+    profiler = st.radio("Profile this query", list(PROFILERS), horizontal=True)
+    profile_query = PROFILERS[profiler]
+
 # ======================================================
 # PROCESS
 # ======================================================
 if user_query:
-
-    # ---------------- GEMINI PARSER ----------------
+    trace = Trace(user_query, profile=profile_query).start()
     try:
-        parsed = gemini_parse_prompt(user_query)
-        parser_used = "gemini"
-    except Exception:
-        parsed = route_prompt(user_query)
-        parser_used = "fallback"
-
-    # ---------------- DATASET SELECTION ----------------
-    dataset_key = parsed.get("dataset", "default")
-    data_path = DATA_FILES.get(dataset_key, DATA_FILES["default"])
-
-    df = load_data(data_path)
-
-    # ---------------- PARSED VALUES ----------------
-    top_n = parsed.get("top_n", 5)
-    level = parsed.get("level", "state")
-    age_group = parsed.get("age_group", "total")
-    graph_title = parsed.get("graph_title", "Aadhaar Analytics Overview")
-
-    # ---------------- APPLY FILTERS ----------------
-    filtered_df = df
-
-    if selected_states:
-        filtered_df = filtered_df[filtered_df["state"].isin(selected_states)]
-
-    if selected_districts:
-        filtered_df = filtered_df[filtered_df["district"].isin(selected_districts)]
-
-    if selected_pincodes:
-        filtered_df = filtered_df[
-            filtered_df["pincode"].astype(str).isin(selected_pincodes)
-        ]
-
-    # ---------------- SUMMARY CARDS ----------------
-    c1, c2, c3, c4 = st.columns(4)
-
-    c1.metric("📄 Records", f"{len(filtered_df):,}")
-    c2.metric("🆔 Total Aadhaar", f"{int(filtered_df['Total_Aadhaar'].sum()):,}")
-    c3.metric("🏙️ States", filtered_df["state"].nunique())
-    c4.metric("📍 Districts", filtered_df["district"].nunique())
-
-    st.divider()
-
-    # ---------------- ANALYSIS ----------------
-    analysis_level = "district" if level == "district" else "state"
-
-    if age_group == "adult":
-        result_df = adult_analysis(filtered_df, analysis_level, top_n)
-    elif age_group == "youth":
-        result_df = youth_analysis(filtered_df, analysis_level, top_n)
-    else:
-        result_df = total_analysis(filtered_df, analysis_level, top_n)
-
-    # ---------------- OUTPUT ----------------
-    left, right = st.columns([3, 1])
-
-    with left:
-        st.markdown(f"### {graph_title}")
-        generate_graph(result_df, "bar", graph_title)
-
-    with right:
-        st.markdown("### 🧠 AI-Generated Insight")
-
-        ai_insight = generate_ai_insight(
-            result_df,
-            context={
-                "level": analysis_level,
-                "age_group": age_group,
-                "state": parsed.get("state"),
-                "parser": parser_used,
-                "dataset": dataset_key
-            }
+        # ---------------- GEMINI PARSER ----------------
+        # parse runs in the background while the likely dataset is warmed
+        parse_future = submit(parse_query, user_query)
+        submit(warm_dataset, DATA_FILES[guess_dataset(user_query)])
+
+        parsed, parser_used = parse_future.result()
+
+        # ---------------- DATASET SELECTION ----------------
+        dataset_key = parsed.get("dataset", "default")
+        data_path = DATA_FILES.get(dataset_key, DATA_FILES["default"])
+
+        with span("load_data", dataset=dataset_key) as record:
+            fingerprint = dataset_version(data_path)
+            df = load_data(data_path)
+            record["rows_out"] = len(df)
+
+        # ---------------- PARSED VALUES ----------------
+        top_n = parsed.get("top_n", 5)
+        ascending = parsed.get("ascending", False)
+        level = parsed.get("level", "state")
+        age_group = parsed.get("age_group", "total")
+        graph_title = parsed.get("graph_title", "Aadhaar Analytics Overview")
+
+        # ---------------- SUMMARY CARDS ----------------
+        # sidebar selections plus the place named in the query ("... in Bihar")
+        filters = query_filters(parsed, selected_states, selected_districts, selected_pincodes)
+        # merged from the filter index's per-pincode partials, no row scan
+        with span("metric_cards"):
+            summary = load_filter_index(data_path).summary(*filters)
+
+        c1, c2, c3, c4 = st.columns(4)
+
+        c1.metric("📄 Records", f"{summary['records']:,}")
+        c2.metric("🆔 Total Aadhaar", f"{summary['total']:,}")
+        c3.metric("🏙️ States", summary["states"])
+        c4.metric("📍 Districts", summary["districts"])
+
+        st.divider()
+
+        # ---------------- ANALYSIS ----------------
+        analysis_level = "district" if level == "district" else "state"
+
+        # sessions asking the same thing at the same time share one groupby
+        analysis_key = (
+            data_path, analysis_level, age_group, top_n, ascending, *filters
         )
 
-        st.info(ai_insight)
-
-    st.divider()
-
-    st.markdown("### 📋 Detailed Data")
-    st.dataframe(result_df, use_container_width=True)
+        # repeated views (reruns, going back to a query) come from the LRU;
+        # a miss is computed once even if several sessions ask at once
+        result_cache = get_result_cache()
+        cache_key = (fingerprint,) + analysis_key
+
+        def exact_analysis():
+            return result_cache.get_or_compute(
+                cache_key, single_flight.do, analysis_key, run_analysis, *analysis_key
+            )
+
+        if approx_mode:
+            exact_future = submit(exact_analysis)
+            with span("approx_top_n", level=analysis_level):
+                sample = load_sample(data_path)
+                result_df = sample.top_n(
+                    analysis_level,
+                    AGE_VALUE_COLS.get(age_group, "Total_Aadhaar"),
+                    top_n,
+                    mask=sample.mask(*filters),
+                    ascending=ascending
+                )
+        else:
+            with span("get_top_n", level=analysis_level) as record:
+                (result_df, record["rows_in"]), record["cache_hit"] = exact_analysis()
+                record["rows_out"] = len(result_df)
+
+        # ---------------- OUTPUT ----------------
+        insight_context = {
+            "level": analysis_level,
+            "age_group": age_group,
+            "state": parsed.get("state"),
+            "parser": parser_used,
+            "dataset": dataset_key
+        }
+
+        # insight is requested first so the LLM call overlaps chart rendering;
+        # in fast mode it waits for the exact result, never the estimate
+        if approx_mode:
+            insight_future = submit(
+                lambda: generate_ai_insight(exact_future.result()[0][0], context=insight_context)
+            )
+        else:
+            insight_future = submit(generate_ai_insight, result_df, context=insight_context)
+
+        left, right = st.columns([3, 1])
+
+        with right:
+            st.markdown("### 🧠 AI-Generated Insight")
+            insight_slot = st.empty()
+            insight_slot.info("Generating insight...")
+
+        with left:
+            st.markdown(f"### {graph_title}")
+            chart_slot = st.empty()
+            with span("generate_graph"), chart_slot.container():
+                generate_graph(result_df, "bar", graph_title)
+
+        st.divider()
+
+        st.markdown("### 📋 Detailed Data")
+        table_slot = st.empty()
+        table_slot.dataframe(result_df, width="stretch")
+
+        # ---------------- EXACT REFINEMENT ----------------
+        if approx_mode:
+            (result_df, _), _ = exact_future.result()
+            with chart_slot.container():
+                generate_graph(result_df, "bar", graph_title)
+            table_slot.dataframe(result_df, width="stretch")
+
+        insight_slot.info(insight_future.result())
+    finally:
+        # also closes the trace (and profiler) when a stage raises or st.stop() runs
+        trace.finish()
+
+    if DEBUG:
+        with st.expander("🛠️ Query trace", expanded=True):
+            st.json(trace.to_dict())
+            st.caption("Result cache")
+            st.json(result_cache.stats())
+            if trace.profile_text:
+                st.code(trace.profile_text)
 
 # ======================================================
 # ABOUT SECTION
@@ -0,0 +1,70 @@
+# benchmarks/bench_top_n.py
+#
+# Compares the partial-selection get_top_n against the previous
+# sort-based implementation at 1k, 100k and 1M groups.
+#
+#   python -m benchmarks.bench_top_n
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import get_top_n, _select_n
+
+GROUP_COUNTS = [1_000, 100_000, 1_000_000]
+ROWS_PER_GROUP = 3
+TOP_N = 10
+REPEATS = 5
+
+
+def sort_top_n(df, group_col, value_col, n):
+    # previous implementation, kept here as the baseline
+    return (
+        df.groupby(group_col)[[value_col]]
+        .sum()
+        .reset_index()
+        .sort_values(value_col, ascending=False)
+        .head(n)
+    )
+
+
+def make_frame(groups, rng):
+    labels = np.array([f"G{i:07d}" for i in range(groups)], dtype=object)
+    return pd.DataFrame({
+        "district": np.repeat(labels, ROWS_PER_GROUP),
+        "Total_Aadhaar": rng.integers(0, 10_000, groups * ROWS_PER_GROUP)
+    })
+
+
+def best_of(fn, *args):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    rng = np.random.default_rng(42)
+
+    print(f"{'groups':>10} {'stage':>8} {'sort (ms)':>11} {'select (ms)':>12} {'speedup':>8}")
+    for groups in GROUP_COUNTS:
+        df = make_frame(groups, rng)
+
+        # end to end: groupby + selection
+        old = best_of(sort_top_n, df, "district", "Total_Aadhaar", TOP_N)
+        new = best_of(get_top_n, df, "district", "Total_Aadhaar", TOP_N)
+        print(f"{groups:>10} {'e2e':>8} {old * 1e3:>11.2f} {new * 1e3:>12.2f} {old / new:>7.1f}x")
+
+        # selection only, over already grouped sums
+        sums = df.groupby("district", sort=False)["Total_Aadhaar"].sum()
+        values, labels = sums.to_numpy(), sums.index.to_numpy()
+        old = best_of(lambda: sums.sort_values(ascending=False).head(TOP_N))
+        new = best_of(_select_n, values, labels, TOP_N)
+        print(f"{groups:>10} {'select':>8} {old * 1e3:>11.2f} {new * 1e3:>12.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# benchmarks/run_bench.py
+#
+# End-to-end benchmark over synthetic data. Reports throughput,
+# p50/p99 latency and peak allocations per stage, plus the process
+# peak RSS, as JSON.
+#
+#   python -m benchmarks.run_bench --rows 1000000 --out bench.json
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import write_csv
+from src.analyzer import get_top_n, adult_analysis, youth_analysis, total_analysis
+from src.filter_index import FilterIndex
+from src.loader import load_csv, load_frame
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def peak_alloc_mb(fn):
+    # one untimed run under tracemalloc: the stage's own peak above its
+    # starting point (numpy buffers are traced, Arrow-allocated ones are not)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def measure(name, fn, repeats, rows=None):
+    alloc = peak_alloc_mb(fn)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    timings = np.array(timings)
+    result = {
+        "stage": name,
+        "repeats": repeats,
+        "p50_ms": round(float(np.percentile(timings, 50)) * 1e3, 3),
+        "p99_ms": round(float(np.percentile(timings, 99)) * 1e3, 3),
+        "peak_alloc_mb": round(alloc, 1)
+    }
+    if rows:
+        result["rows_per_sec"] = round(rows / float(np.median(timings)))
+
+    print(f"{name:<28} p50 {result['p50_ms']:>10.2f} ms  p99 {result['p99_ms']:>10.2f} ms", file=sys.stderr)
+    return result
+
+
+def run(rows, repeats, seed):
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic.csv")
+        cache_dir = os.path.join(tmp, "cache")
+        write_csv(csv_path, rows, seed=seed)
+
+        # ---------- LOADING ----------
+        results.append(measure(
+            "load_csv (no cache)",
+            lambda: load_csv(csv_path, use_cache=False),
+            max(1, repeats // 10), rows
+        ))
+        results.append(measure(
+            "load_data (cold, builds cache)",
+            lambda: load_frame(csv_path, cache_dir=os.path.join(tmp, f"cold{time.time_ns()}")),
+            max(1, repeats // 10), rows
+        ))
+        load_frame(csv_path, cache_dir=cache_dir)
+        results.append(measure(
+            "load_data (warm, mmap)",
+            lambda: load_frame(csv_path, cache_dir=cache_dir),
+            repeats, rows
+        ))
+        results.append(measure(
+            "load_csv (stream)",
+            lambda: load_csv(csv_path, stream=True),
+            max(1, repeats // 10), rows
+        ))
+
+        df = load_frame(csv_path, cache_dir=cache_dir)
+
+        # ---------- ANALYSIS ----------
+        results.append(measure(
+            "get_top_n (district)",
+            lambda: get_top_n(df, "district", "Total_Aadhaar", 10),
+            repeats, rows
+        ))
+        for fn in (adult_analysis, youth_analysis, total_analysis):
+            for level in ("state", "district"):
+                results.append(measure(
+                    f"{fn.__name__} ({level})",
+                    lambda fn=fn, level=level: fn(df, level, 10),
+                    repeats, rows
+                ))
+
+        # ---------- FILTER CASCADE ----------
+        results.append(measure(
+            "filter index build",
+            lambda: FilterIndex(df),
+            max(1, repeats // 10), rows
+        ))
+        index = FilterIndex(df)
+        states = index.states[:2]
+        districts = index.districts(states)[:3]
+
+        def cascade():
+            index.districts(states)
+            index.pincodes(states, districts)
+            index.summary(states, districts)
+
+        results.append(measure("filter cascade", cascade, repeats))
+
+        # ---------- INSIGHT SUMMARY ----------
+        try:
+            from src.ai.gemini_insight import _build_data_summary
+        except Exception as e:
+            results.append({"stage": "_build_data_summary", "skipped": str(e)})
+        else:
+            result_df = total_analysis(df, "district", 10)
+            context = {"level": "district", "age_group": "total", "state": None}
+            results.append(measure(
+                "_build_data_summary",
+                lambda: _build_data_summary(result_df, context),
+                repeats
+            ))
+
+    return {
+        "rows": rows,
+        "repeats": repeats,
+        "seed": seed,
+        "python": sys.version.split()[0],
+        "results": results,
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aadhaar analytics benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = run(args.rows, args.repeats, args.seed)
+    payload = json.dumps(report, indent=2)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
@@ -0,0 +1,97 @@
+# benchmarks/synthetic.py
+#
+# Synthetic Aadhaar demographic data with the real schema
+# (date, state, district, pincode, demo_age_5_17, demo_age_17_).
+#
+#   python -m benchmarks.synthetic --rows 1000000 --out data/input/synthetic.csv
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+STATES = [
+    "Uttar Pradesh", "Maharashtra", "Bihar", "West Bengal", "Madhya Pradesh",
+    "Tamil Nadu", "Rajasthan", "Karnataka", "Gujarat", "Andhra Pradesh",
+    "Odisha", "Telangana", "Kerala", "Jharkhand", "Assam", "Punjab",
+    "Chhattisgarh", "Haryana", "Delhi", "Jammu And Kashmir", "Uttarakhand",
+    "Himachal Pradesh", "Tripura", "Meghalaya", "Manipur", "Nagaland", "Goa",
+    "Arunachal Pradesh", "Puducherry", "Mizoram", "Chandigarh", "Sikkim",
+    "Andaman And Nicobar Islands", "Dadra And Nagar Haveli", "Ladakh", "Lakshadweep"
+]
+
+# A few raw spellings the loader is expected to normalize
+MISSPELLINGS = {
+    "West Bengal": ["west bangal", "Westbengal"],
+    "Odisha": ["Orissa"],
+    "Chhattisgarh": ["Chattisgarh"]
+}
+
+
+def _zipf_weights(count, skew):
+    weights = 1.0 / np.arange(1, count + 1) ** skew
+    return weights / weights.sum()
+
+
+def generate(rows, districts_per_state=25, pincodes_per_district=40,
+             days=180, skew=1.1, misspell_rate=0.01, seed=0):
+    """
+    Returns a raw frame (string dates, unnormalized names) whose state,
+    district and pincode frequencies follow a Zipf-like skew, as in the
+    real extracts where a few large states dominate.
+    """
+    rng = np.random.default_rng(seed)
+
+    state_idx = rng.choice(len(STATES), rows, p=_zipf_weights(len(STATES), skew))
+    district_idx = rng.choice(
+        districts_per_state, rows, p=_zipf_weights(districts_per_state, skew)
+    )
+    pincode_idx = rng.choice(
+        pincodes_per_district, rows, p=_zipf_weights(pincodes_per_district, skew)
+    )
+
+    states = np.array(STATES, dtype=object)[state_idx]
+    districts = pd.Series(states).str.split().str[0].to_numpy(dtype=object) \
+        + " District " + district_idx.astype(str)
+
+    # 6-digit pincodes, unique per (state, district, slot)
+    pincodes = 110000 + (
+        state_idx * districts_per_state * pincodes_per_district
+        + district_idx * pincodes_per_district
+        + pincode_idx
+    ) % 890000
+
+    for canonical, variants in MISSPELLINGS.items():
+        mask = (states == canonical) & (rng.random(rows) < misspell_rate)
+        states[mask] = rng.choice(variants, mask.sum())
+
+    dates = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, days, rows), unit="D")
+
+    youth = rng.poisson(12, rows)
+    adults = rng.poisson(45, rows)
+
+    return pd.DataFrame({
+        "date": dates.strftime("%d-%m-%Y"),
+        "state": states,
+        "district": districts,
+        "pincode": pincodes,
+        "demo_age_5_17": youth,
+        "demo_age_17_": adults
+    })
+
+
+def write_csv(path, rows, **kwargs):
+    generate(rows, **kwargs).to_csv(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetic Aadhaar CSV generator")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--out", default="data/input/synthetic.csv")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skew", type=float, default=1.1)
+    args = parser.parse_args()
+
+    write_csv(args.out, args.rows, seed=args.seed, skew=args.skew)
+    print(f"Wrote {args.rows:,} rows to {args.out}")
@@ -1,22 +1,83 @@
+import argparse
+import json
+import multiprocessing
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 
 # Pehle env load karna 
 load_dotenv()
 
 # Imports from src folder
-from src.loader import load_csv
+from src.loader import stream_rollups
 from src.analyzer import (
+    AnalysisEngine,
     age_wise_coverage, youth_pressure, adult_saturation, 
     temporal_growth, district_disparity, pincode_coverage, 
     youth_adult_ratio, state_concentration, longitudinal_stability,
     resource_allocation, adult_enrollment_mapping
 )
-from src.visualizer import generate_graph
-from src.prompt_router import route_prompt
+from src.visualizer import save_graph, GRAPH_DIR
+from src.prompt_router import route_topics
+from src.partitions import PartitionStore
 
-def main():
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Ensure file name matches exactly with your folder
+CSV_PATH = os.path.join(BASE_DIR, "data", "input", "aadhar_clean.csv")
+PROMPT_LIST = os.path.join(BASE_DIR, "prompts", "prompt_list.txt")
+
+# Topic to Function Mapping
+ANALYSIS_MAP = {
+    "Age-wise Aadhaar Coverage Imbalance": age_wise_coverage,
+    "Regional Youth Population Pressure": youth_pressure,
+    "Adult Enrollment Saturation Mapping": adult_enrollment_mapping,
+    "Temporal Growth Pattern Analysis": temporal_growth,
+    "District-Level Demographic Disparity": district_disparity,
+    "Pincode-Level Coverage Gaps": pincode_coverage,
+    "Youth-to-Adult Ratio Risk Zones": youth_adult_ratio,
+    "State-wise Demographic Concentration": state_concentration,
+    "Longitudinal Stability Assessment": longitudinal_stability,
+    "Resource Allocation Optimization": resource_allocation
+}
+
+# Streamed grains: per pincode for the ranking topics, state x month for the temporal ones
+ENGINE_GRAINS = [["state", "district", "pincode"], ["state", "month"]]
+
+def graph_type_for(problem):
+    # Smart graph selection
+    return "line" if "Temporal" in problem or "Longitudinal" in problem else "bar"
+
+def load_engine(csv_path, partitions=None):
+    if partitions:
+        # Base-grain rows and the monthly rollup both come from the store,
+        # so every topic sees the same appended extracts
+        print(f"Loading partition store: {partitions}")
+        store = PartitionStore(partitions)
+        df, monthly = store.read(), store.monthly()
+    else:
+        print("Loading CSV file... (Big files may take a moment)")
+        # Streaming mode: chunks are folded into the two grains the topics
+        # read (pincode and state x month); raw rows are never held
+        try:
+            df, monthly = stream_rollups(csv_path, ENGINE_GRAINS, dated_only=True)
+        except FileNotFoundError:
+            print(f"Error: File not found at {csv_path}")
+            return None
+        monthly = monthly.dropna(subset=["month"])
+        monthly["month"] = monthly["month"].astype(str)
+
+    if df is None or df.empty:
+        print("Error: DataFrame load nahi ho paya ya empty hai.")
+        return None
+
+    print(f"Data Loaded! Total rows: {int(df['records'].sum())} ({len(df)} groups)")
+
+    # One shared grouped pass; every topic reads from it
+    return AnalysisEngine(df, monthly=monthly)
+
+def main(partitions=None):
     print("--- Aadhaar AI Analytics System ---")
     
     # -----------------------------
@@ -32,39 +93,18 @@ def main():
     # -----------------------------
     # 2. Path Configuration
     # -----------------------------
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    # Ensure file name matches exactly with your folder
-    csv_path = os.path.join(BASE_DIR, "data", "input", "aadhar_clean.csv")
-
-    # Topic to Function Mapping
-    ANALYSIS_MAP = {
-        "Age-wise Aadhaar Coverage Imbalance": age_wise_coverage,
-        "Regional Youth Population Pressure": youth_pressure,
-        "Adult Enrollment Saturation Mapping": adult_enrollment_mapping,
-        "Temporal Growth Pattern Analysis": temporal_growth,
-        "District-Level Demographic Disparity": district_disparity,
-        "Pincode-Level Coverage Gaps": pincode_coverage,
-        "Youth-to-Adult Ratio Risk Zones": youth_adult_ratio,
-        "State-wise Demographic Concentration": state_concentration,
-        "Longitudinal Stability Assessment": longitudinal_stability,
-        "Resource Allocation Optimization": resource_allocation
-    }
+    csv_path = CSV_PATH
 
     # -----------------------------
     # 3. Data Loading
     # -----------------------------
-    if not os.path.exists(csv_path):
+    if not partitions and not os.path.exists(csv_path):
         print(f"Error: Data file nahi mili at: {csv_path}")
         return
 
-    print("Loading CSV file... (Big files may take a moment)")
-    df = load_csv(csv_path, use_chunks=True)
-    
-    if df is None or df.empty:
-        print("Error: DataFrame load nahi ho paya ya empty hai.")
+    engine = load_engine(csv_path, partitions)
+    if engine is None:
         return
-        
-    print(f"Data Loaded! Total rows: {len(df)}")
 
     # -----------------------------
     # 4. User Interaction
@@ -72,7 +112,7 @@ def main():
     user_prompt = input("\nAapka Aadhaar query kya hai? ")
 
     print("\nGemini AI routing process mein hai...")
-    problem_labels = route_prompt(user_prompt)
+    problem_labels = route_topics(user_prompt)
 
     if not problem_labels:
         print("Gemini ne koi matching topic return nahi kiya. Query check karein.")
@@ -88,12 +128,12 @@ def main():
             print(f"\nProcessing: {problem}...")
             try:
                 # Call analyzer function
-                result_df = ANALYSIS_MAP[problem](df)
+                result_df = ANALYSIS_MAP[problem](engine)
                 
                 if result_df is not None and not result_df.empty:
-                    # Smart graph selection
-                    g_type = "line" if "Temporal" in problem or "Longitudinal" in problem else "bar"
-                    generate_graph(result_df, graph_type=g_type, title=problem)
+                    out_dir = os.path.join(BASE_DIR, GRAPH_DIR)
+                    for path in save_graph(result_df, graph_type_for(problem), problem, out_dir=out_dir):
+                        print(f"Saved: {path}")
                 else:
                     print(f"Result empty for: {problem}")
             except Exception as e:
@@ -103,5 +143,143 @@ def main():
 
     print("\n--- Process Complete. Check data/output/graphs/ ---")
 
+# ======================================================
+# BATCH REPORT MODE
+# ======================================================
+def read_queries(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def _render_job(result_df, graph_type, title, out_dir, formats):
+    # Runs in a worker process; figures use the Agg/SVG canvases only
+    import matplotlib
+    matplotlib.use("Agg")
+
+    start = time.perf_counter()
+    paths = save_graph(result_df, graph_type, title, out_dir=out_dir, formats=formats)
+    return paths, time.perf_counter() - start
+
+def run_batch(queries_path, out_dir, formats, workers, partitions=None):
+    """
+    Non-interactive report run: every query in ``queries_path`` is routed
+    to its topics, each topic is analysed once and all graphs are
+    rendered in a process pool. Writes ``manifest.json`` with timings.
+    """
+    batch_start = time.perf_counter()
+
+    if not partitions and not os.path.exists(CSV_PATH):
+        print(f"Error: Data file nahi mili at: {CSV_PATH}")
+        return 1
+
+    load_start = time.perf_counter()
+    engine = load_engine(CSV_PATH, partitions)
+    if engine is None:
+        return 1
+    load_seconds = time.perf_counter() - load_start
+
+    queries = read_queries(queries_path)
+    routed = {query: route_topics(query) for query in queries}
+
+    # Each topic is analysed once even if several queries map to it
+    topics = []
+    for labels in routed.values():
+        topics.extend(t for t in labels if t in ANALYSIS_MAP and t not in topics)
+
+    entries = {}
+    for topic in topics:
+        start = time.perf_counter()
+        try:
+            result_df = ANALYSIS_MAP[topic](engine)
+            error = None
+        except Exception as e:
+            result_df, error = None, str(e)
+
+        entries[topic] = {
+            "topic": topic,
+            "graph_type": graph_type_for(topic),
+            "rows": 0 if result_df is None else len(result_df),
+            "analysis_seconds": round(time.perf_counter() - start, 4),
+            "files": [],
+            "error": error,
+            "_result": result_df
+        }
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = {
+            topic: pool.submit(
+                _render_job, entry["_result"], entry["graph_type"], topic, out_dir, formats
+            )
+            for topic, entry in entries.items()
+            if entry["rows"]
+        }
+
+        for topic, future in futures.items():
+            try:
+                paths, seconds = future.result()
+                entries[topic]["files"] = paths
+                entries[topic]["render_seconds"] = round(seconds, 4)
+                print(f"Saved: {', '.join(paths)}")
+            except Exception as e:
+                entries[topic]["error"] = str(e)
+                print(f"Error rendering {topic}: {e}")
+
+    for entry in entries.values():
+        entry.pop("_result")
+
+    manifest = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": os.path.relpath(partitions or CSV_PATH, BASE_DIR),
+        "queries": [{"query": q, "topics": t} for q, t in routed.items()],
+        "results": list(entries.values()),
+        "timings": {
+            "load_seconds": round(load_seconds, 4),
+            "total_seconds": round(time.perf_counter() - batch_start, 4)
+        }
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"\n--- Batch Complete: {len(entries)} topic(s). Manifest: {manifest_path} ---")
+    return 0 if all(e["error"] is None for e in entries.values()) else 1
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Aadhaar AI Analytics CLI")
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="non-interactive report run over a file of queries"
+    )
+    parser.add_argument(
+        "--queries", default=PROMPT_LIST,
+        help="one query per line (default: prompts/prompt_list.txt)"
+    )
+    parser.add_argument(
+        "--out", default=os.path.join(BASE_DIR, GRAPH_DIR),
+        help="output directory for graphs and manifest.json"
+    )
+    parser.add_argument(
+        "--formats", default="png",
+        help="comma separated: png,svg"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="render processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--partitions", nargs="?", const=os.path.join(BASE_DIR, "data", "partitions"),
+        default=None,
+        help="analyse the partition store (python -m src.partitions) instead of the CSV"
+    )
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.batch:
+        formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+        sys.exit(run_batch(args.queries, args.out, formats, args.workers, args.partitions))
+    main(args.partitions)
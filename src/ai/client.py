@@ -0,0 +1,151 @@
+# src/ai/client.py
+
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+
+from src.ai.resilience import CircuitBreaker, call_with_retry
+
+# ------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------
+load_dotenv()
+
+MODEL_NAME = "models/gemini-2.5-flash"
+
+# "gemini" (default) or "stub" (offline, deterministic answers)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+
+# per-attempt socket timeout and whole-call budget (seconds)
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "8"))
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "15"))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", "2"))
+
+# shared by every session: once Gemini is failing, nobody waits on it
+breaker = CircuitBreaker(
+    threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", "3")),
+    cooldown=float(os.getenv("LLM_BREAKER_COOLDOWN", "60"))
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class LLMUnavailable(RuntimeError):
+    """No usable LLM backend (missing key or SDK)."""
+
+
+# ------------------------------------------------------
+# SHARED CLIENT
+# ------------------------------------------------------
+def get_client():
+    """
+    Returns the process-wide backend, created on first use.
+
+    The google-genai SDK is only imported here, so importing the parser
+    or insight modules costs nothing and works without a key. One
+    ``genai.Client`` (and its HTTP connection pool) is shared by every
+    session and thread.
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            _client = _create_client(LLM_BACKEND)
+    return _client
+
+
+def set_backend(backend):
+    """
+    Plugs in any object with ``generate_content(model=, contents=)``
+    (e.g. ``StubBackend()``); ``None`` resets to the configured backend.
+    """
+    global _client
+    with _client_lock:
+        _client = backend
+
+
+def model_tag():
+    """
+    Identifies who answers, for response-cache keys, so stub replies
+    never mix with real model output. Does not create the client.
+    """
+    backend = _client if _client is not None else LLM_BACKEND
+    if backend == "stub" or isinstance(backend, StubBackend):
+        return "stub"
+    return MODEL_NAME
+
+
+def generate_content(prompt, model=MODEL_NAME):
+    """
+    One model call with retries on transient errors, an overall
+    deadline and the shared circuit breaker. A retry is skipped when
+    less than ``LLM_TIMEOUT`` of the deadline is left. Raises
+    ``CircuitOpen`` immediately while the breaker is open.
+    """
+    return call_with_retry(
+        lambda: get_client().generate_content(model=model, contents=prompt),
+        breaker=breaker,
+        deadline=LLM_DEADLINE,
+        retries=LLM_RETRIES,
+        attempt_timeout=LLM_TIMEOUT
+    )
+
+
+def _create_client(backend):
+    if backend == "stub":
+        return StubBackend()
+
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise LLMUnavailable("GEMINI_API_KEY not found in .env")
+
+    try:
+        from google import genai
+    except ImportError as e:
+        raise LLMUnavailable(f"google-genai is not installed: {e}")
+
+    client = genai.Client(
+        api_key=api_key,
+        http_options={"api_version": "v1", "timeout": int(LLM_TIMEOUT * 1000)}
+    )
+    return client.models
+
+
+# ------------------------------------------------------
+# LOCAL STUB
+# ------------------------------------------------------
+class StubBackend:
+    """
+    Offline stand-in for ``client.models``. Parser prompts are answered
+    with the local intent router's JSON, anything else with a fixed
+    "Solution:" paragraph. No network, no key, deterministic.
+    """
+
+    def __init__(self, responder=None):
+        self.responder = responder or _stub_reply
+        self.calls = 0
+
+    def generate_content(self, model, contents):
+        self.calls += 1
+        return SimpleNamespace(text=self.responder(contents), usage_metadata=None)
+
+
+def _stub_reply(prompt):
+    if "Return ONLY valid JSON" in prompt:
+        from src.prompt_router import IntentRouter
+
+        query = prompt.rsplit("User query:", 1)[-1].strip()
+        parsed, _ = IntentRouter([], []).parse(query)
+        return json.dumps(parsed)
+
+    return (
+        "Solution:\n"
+        "Offline mode: the AI model is not connected, so no generated insight is "
+        "available. The chart and table above reflect the selected data."
+    )
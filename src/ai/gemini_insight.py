@@ -1,31 +1,13 @@
 # src/ai/gemini_insight.py
 
-from dotenv import load_dotenv
-import os
 from typing import Dict
 import pandas as pd
-from google import genai
 
+from src.ai.client import MODEL_NAME, generate_content, model_tag
+from src.ai.response_cache import response_cache
+from src.pipeline import single_flight
+from src.tracing import span, record_llm_usage
 
-# ------------------------------------------------------
-# ENV LOAD
-# ------------------------------------------------------
-load_dotenv()
-
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
-    raise RuntimeError("GEMINI_API_KEY not found in .env")
-
-# ------------------------------------------------------
-# GEMINI CLIENT (NEW SDK, v1)
-# ------------------------------------------------------
-client = genai.Client(
-    api_key=GEMINI_API_KEY,
-    http_options={"api_version": "v1"}
-)
-
-MODEL_NAME = "models/gemini-2.5-flash"
 
 # ------------------------------------------------------
 # SYSTEM PROMPT
@@ -71,6 +53,22 @@ def generate_ai_insight(
 
     summary_text = _build_data_summary(result_df, context)
 
+    cache_key = response_cache.make_key("insight", summary_text, context, model_tag())
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        with span("gemini_insight", model=MODEL_NAME, cache_hit=True):
+            return cached
+
+    # identical summaries from other sessions share one in-flight call
+    return single_flight.do(
+        ("insight", cache_key), _insight_uncached, summary_text, context, cache_key
+    )
+
+
+# ------------------------------------------------------
+# HELPERS
+# ------------------------------------------------------
+def _insight_uncached(summary_text: str, context: Dict, cache_key: str) -> str:
     prompt = f"""
 System instruction:
 {SYSTEM_PROMPT}
@@ -84,10 +82,9 @@ Data summary:
 
     # -------- Gemini Call --------
     try:
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt
-        )
+        with span("gemini_insight", model=MODEL_NAME, cache_hit=False) as record:
+            response = generate_content(prompt)
+            record_llm_usage(record, response)
         insight = response.text.strip()
     except Exception as e:
         return (
@@ -96,12 +93,12 @@ Data summary:
             "address localized challenges."
         )
 
+    # only real model answers are cached, never the fallback text
+    response_cache.set(cache_key, insight)
+
     return insight
 
 
-# ------------------------------------------------------
-# HELPERS
-# ------------------------------------------------------
 def _build_data_summary(df: pd.DataFrame, context: Dict) -> str:
     """
     Converts the result dataframe into a compact textual summary
@@ -1,31 +1,14 @@
 # src/ai/gemini_parser.py
 
-from dotenv import load_dotenv
-import os
 import json
 import re
 from typing import Dict
-from google import genai
 
-# ------------------------------------------------------
-# ENV LOAD
-# ------------------------------------------------------
-load_dotenv()
-
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
-    raise RuntimeError("GEMINI_API_KEY not found in .env")
-
-# ------------------------------------------------------
-# GEMINI CLIENT (NEW SDK, v1)
-# ------------------------------------------------------
-client = genai.Client(
-    api_key=GEMINI_API_KEY,
-    http_options={"api_version": "v1"}
-)
-
-MODEL_NAME = "models/gemini-2.5-flash"
+from src.ai.client import MODEL_NAME, generate_content, model_tag
+from src.ai.response_cache import response_cache, normalize_query
+from src.ai.schema import normalize_parsed as _normalize
+from src.pipeline import single_flight
+from src.tracing import span, record_llm_usage
 
 
 # ------------------------------------------------------
@@ -47,6 +30,7 @@ JSON format:
   "state": "state name or null",
   "age_group": "adult | youth | total",
   "top_n": number,
+  "ascending": true | false,
   "analysis_type": "enrolment | biometric | saturation",
   "graph_title": "clear human readable title"
 }
@@ -56,6 +40,7 @@ Rules:
 - If districts are mentioned → level = district
 - If a state name is mentioned → include it
 - If number missing → top_n = 5
+- If the query asks for bottom / lowest / least / fewest → ascending = true, otherwise false
 - If age unclear → total
 - Graph title must be meaningful
 - If query mentions biometric → dataset = biometric
@@ -74,6 +59,24 @@ def gemini_parse_prompt(user_prompt: str) -> Dict:
     and returns structured analytics instructions.
     """
 
+    with span("gemini_parse", model=MODEL_NAME) as record:
+        cache_key = response_cache.make_key("parse", normalize_query(user_prompt), model_tag())
+        cached = response_cache.get(cache_key)
+        record["cache_hit"] = cached is not None
+        if cached is not None:
+            return _normalize(json.loads(cached))
+
+        # identical queries from other sessions share one in-flight call
+        parsed = single_flight.do(
+            ("parse", cache_key), _parse_uncached, user_prompt, cache_key, record
+        )
+        return dict(parsed)
+
+
+# ------------------------------------------------------
+# HELPERS
+# ------------------------------------------------------
+def _parse_uncached(user_prompt: str, cache_key: str, record: Dict) -> Dict:
     print("🔥 GEMINI PARSER (NEW SDK) CALLED 🔥")
 
     prompt = f"""
@@ -86,10 +89,8 @@ User query:
 
     # -------- Gemini Call --------
     try:
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=prompt
-        )
+        response = generate_content(prompt)
+        record_llm_usage(record, response)
         raw_text = response.text.strip()
     except Exception as e:
         raise RuntimeError(f"Gemini API call failed: {e}")
@@ -101,46 +102,14 @@ User query:
     except Exception as e:
         raise ValueError(f"Gemini JSON parsing failed: {e}")
 
-    return _normalize(parsed)
+    parsed = _normalize(parsed)
+    response_cache.set(cache_key, json.dumps(parsed))
+
+    return parsed
 
 
-# ------------------------------------------------------
-# HELPERS
-# ------------------------------------------------------
 def _extract_json(text: str) -> str:
     match = re.search(r"\{.*\}", text, re.DOTALL)
     if not match:
         raise ValueError("No JSON found in Gemini response")
     return match.group(0)
-
-
-def _normalize(parsed: Dict) -> Dict:
-    parsed.setdefault("level", "state")
-    parsed.setdefault("state", None)
-    parsed.setdefault("age_group", "total")
-    parsed.setdefault("analysis_type", "enrolment")
-    parsed.setdefault("dataset", "default")
-
-    if parsed["dataset"] not in ["default", "biometric", "enrolment"]:
-        parsed["dataset"] = "default"
-
-    # top_n
-    try:
-        parsed["top_n"] = int(parsed.get("top_n", 5))
-    except Exception:
-        parsed["top_n"] = 5
-
-    if parsed["top_n"] <= 0 or parsed["top_n"] > 20:
-        parsed["top_n"] = 5
-
-    # validations
-    if parsed["age_group"] not in ["adult", "youth", "total"]:
-        parsed["age_group"] = "total"
-
-    if parsed["level"] not in ["state", "district"]:
-        parsed["level"] = "state"
-
-    if not parsed.get("graph_title"):
-        parsed["graph_title"] = "Aadhaar Analytics Overview"
-
-    return parsed
@@ -0,0 +1,122 @@
+# src/ai/resilience.py
+
+import random
+import threading
+import time
+
+# HTTP codes worth another attempt: rate limit and server-side failures
+TRANSIENT_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpen(RuntimeError):
+    """Raised without calling upstream while the breaker is cooling down."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """The call's overall time budget ran out."""
+
+
+class CircuitBreaker:
+    """
+    Process-wide failure counter for one upstream.
+
+    After ``threshold`` consecutive failures the breaker opens and every
+    call fails fast for ``cooldown`` seconds. After that a single trial
+    call is let through (half-open): success closes it again, failure
+    re-opens it for another cool-down.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, threshold=3, cooldown=60.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                # one trial request; others keep failing fast until it reports back
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def retry_after(self):
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+
+def is_transient(error):
+    """
+    Timeouts, connection drops, 429 and 5xx. Anything else (bad key,
+    bad request, missing SDK) fails the same way on every attempt.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if getattr(error, "code", None) in TRANSIENT_CODES:
+        return True
+    if getattr(error, "status_code", None) in TRANSIENT_CODES:
+        return True
+    # httpx.TimeoutException / ConnectError without importing httpx
+    name = type(error).__name__
+    return "Timeout" in name or "Connect" in name
+
+
+def call_with_retry(fn, breaker=None, deadline=30.0, retries=2, base_delay=0.5, max_delay=4.0,
+                    attempt_timeout=0.0):
+    """
+    Calls ``fn()`` with at most ``retries`` extra attempts on transient
+    errors, full-jitter exponential backoff between them, and never past
+    ``deadline`` seconds in total. Each failed call (after its retries)
+    counts once against ``breaker``.
+
+    ``fn`` cannot be interrupted, so a retry is only started when the
+    budget left after the backoff still covers a full
+    ``attempt_timeout`` (the per-attempt socket timeout).
+    """
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpen(f"LLM circuit open, retry in {breaker.retry_after():.0f}s")
+
+    stop_at = time.monotonic() + deadline
+    attempt = 0
+
+    while True:
+        try:
+            result = fn()
+        except Exception as e:
+            remaining = stop_at - time.monotonic()
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+            if attempt < retries and is_transient(e) and remaining - delay > attempt_timeout:
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            if breaker is not None:
+                breaker.record_failure()
+            if remaining <= 0 and not isinstance(e, TimeoutError):
+                raise DeadlineExceeded(f"LLM call exceeded {deadline:.0f}s: {e}") from e
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
@@ -0,0 +1,145 @@
+# src/ai/response_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+# ------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------
+CACHE_PATH = os.path.join("data", "cache", "gemini_responses.sqlite")
+DEFAULT_TTL = 7 * 24 * 3600     # seconds
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache for Gemini responses.
+
+    Entries expire after ``ttl`` seconds; once more than ``max_entries``
+    are stored the least recently used ones are evicted.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ready = False
+
+    # ------------------------------------------------------
+    # PUBLIC API
+    # ------------------------------------------------------
+    @staticmethod
+    def make_key(namespace: str, *parts) -> str:
+        payload = json.dumps([namespace, *parts], sort_keys=True, default=str)
+        return namespace + ":" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None or now - row[1] > self.ttl:
+                    if row is not None:
+                        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.misses += 1
+                    return None
+
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self.hits += 1
+                return row[0]
+        except (sqlite3.Error, OSError):
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, now, now)
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except (sqlite3.Error, OSError):
+            # caching is best effort; never break the request path
+            pass
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    # ------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=5)
+
+        if not self._ready:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+            )
+            self._ready = True
+
+        return _closing(conn)
+
+
+class _closing:
+    """
+    sqlite3's own context manager commits but never closes.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.conn.commit()
+        finally:
+            self.conn.close()
+        return False
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+# Shared by the parser and insight modules
+response_cache = ResponseCache()
@@ -0,0 +1,79 @@
+# src/ai/schema.py
+
+from typing import Dict, Tuple
+
+from src.normalize import clean_state_name
+
+# ------------------------------------------------------
+# PARSED QUERY SCHEMA
+# ------------------------------------------------------
+# Shared by the Gemini parser and the local intent router so both
+# return exactly the same shape.
+DATASETS = ["default", "biometric", "enrolment"]
+LEVELS = ["state", "district"]
+AGE_GROUPS = ["adult", "youth", "total"]
+
+DEFAULT_TOP_N = 5
+MAX_TOP_N = 20
+DEFAULT_GRAPH_TITLE = "Aadhaar Analytics Overview"
+
+
+def normalize_parsed(parsed: Dict) -> Dict:
+    parsed.setdefault("level", "state")
+    parsed.setdefault("state", None)
+    parsed.setdefault("age_group", "total")
+    parsed.setdefault("analysis_type", "enrolment")
+    parsed.setdefault("dataset", "default")
+
+    # bottom-N ("lowest", "least") instead of top-N
+    parsed["ascending"] = parsed.get("ascending") in (True, "true", "True", 1)
+
+    if parsed["dataset"] not in DATASETS:
+        parsed["dataset"] = "default"
+
+    # top_n
+    try:
+        parsed["top_n"] = int(parsed.get("top_n", DEFAULT_TOP_N))
+    except Exception:
+        parsed["top_n"] = DEFAULT_TOP_N
+
+    if parsed["top_n"] <= 0 or parsed["top_n"] > MAX_TOP_N:
+        parsed["top_n"] = DEFAULT_TOP_N
+
+    # validations
+    if parsed["age_group"] not in AGE_GROUPS:
+        parsed["age_group"] = "total"
+
+    if parsed["level"] not in LEVELS:
+        parsed["level"] = "state"
+
+    if not parsed.get("graph_title"):
+        parsed["graph_title"] = DEFAULT_GRAPH_TITLE
+
+    return parsed
+
+
+# ------------------------------------------------------
+# FILTERS
+# ------------------------------------------------------
+def query_filters(parsed: Dict, states=(), districts=(), pincodes=()) -> Tuple:
+    """
+    Hashable (states, districts, pincodes) for a parsed query: explicit
+    filter lists (sidebar selections, batch ``states`` / ``districts`` /
+    ``pincodes``) plus the place the query itself names (``state``, and
+    the router's ``district``).
+    """
+    states = list(states) + list(parsed.get("states") or [])
+    districts = list(districts) + list(parsed.get("districts") or [])
+    pincodes = list(pincodes) + list(parsed.get("pincodes") or [])
+
+    if parsed.get("state"):
+        states.append(parsed["state"])
+    if parsed.get("district"):
+        districts.append(parsed["district"])
+
+    return (
+        tuple(sorted({clean_state_name(s) for s in states})),
+        tuple(sorted(set(districts))),
+        tuple(sorted({str(p) for p in pincodes}))
+    )
@@ -1,15 +1,49 @@
-# src/analyzer.py
+from functools import cached_property
 
+import numpy as np
 import pandas as pd
 
-def get_top_n(df, group_col, value_col, n):
-    return (
-        df.groupby(group_col)[[value_col]]
-        .sum()
-        .reset_index()
-        .sort_values(value_col, ascending=False)
-        .head(n)
-    )
+def get_top_n(df, group_col, value_col, n, ascending=False):
+    """
+    Top (or bottom, with ascending=True) n groups by summed value_col.
+
+    Uses partial selection over the group sums instead of sorting every
+    group; ties are broken by group label so results are deterministic.
+    """
+    grouped = df.groupby(group_col, observed=True, sort=False)[value_col].sum()
+
+    positions = _select_n(grouped.to_numpy(), grouped.index.to_numpy(), n, ascending)
+
+    return grouped.iloc[positions].reset_index()
+
+def _select_n(values, labels, n, ascending=False):
+    size = len(values)
+    n = max(0, min(n, size))
+
+    if n == size:
+        candidates = np.arange(size)
+    elif n == 0:
+        return np.arange(0)
+    else:
+        # n-th best value; everything strictly better is always kept
+        if ascending:
+            kth = np.partition(values, n - 1)[n - 1]
+            better = np.flatnonzero(values < kth)
+        else:
+            kth = np.partition(values, size - n)[size - n]
+            better = np.flatnonzero(values > kth)
+
+        ties = np.flatnonzero(values == kth)
+        ties = ties[np.argsort(labels[ties], kind="stable")][: n - len(better)]
+        candidates = np.concatenate([better, ties])
+
+    # final ordering only touches the n selected groups:
+    # label order first, then a stable sort on value
+    candidates = candidates[np.argsort(labels[candidates], kind="stable")]
+    selected = values[candidates]
+    order = np.argsort(selected if ascending else -selected, kind="stable")
+
+    return candidates[order]
 
 def get_total_by_state(df, state_name):
     return (
@@ -18,14 +52,192 @@ def get_total_by_state(df, state_name):
         .sum()
     )
 
-def adult_analysis(df, level, top_n):
+# value column behind each parser age_group
+AGE_VALUE_COLS = {
+    "adult": "demo_age_17_",
+    "youth": "demo_age_5_17",
+    "total": "Total_Aadhaar"
+}
+
+def adult_analysis(df, level, top_n, ascending=False):
     group_col = "district" if level == "district" else "state"
-    return get_top_n(df, group_col, "demo_age_17_", top_n)
+    return get_top_n(df, group_col, "demo_age_17_", top_n, ascending)
 
-def youth_analysis(df, level, top_n):
+def youth_analysis(df, level, top_n, ascending=False):
     group_col = "district" if level == "district" else "state"
-    return get_top_n(df, group_col, "demo_age_5_17", top_n)
+    return get_top_n(df, group_col, "demo_age_5_17", top_n, ascending)
 
-def total_analysis(df, level, top_n):
+def total_analysis(df, level, top_n, ascending=False):
     group_col = "district" if level == "district" else "state"
-    return get_top_n(df, group_col, "Total_Aadhaar", top_n)
+    return get_top_n(df, group_col, "Total_Aadhaar", top_n, ascending)
+
+# ======================================================
+# PROMPT LIST ANALYSIS ENGINE
+# ======================================================
+ENGINE_KEYS = ["state", "district", "pincode", "date"]
+ENGINE_VALUES = ["demo_age_5_17", "demo_age_17_", "Total_Aadhaar", "records"]
+RESULT_ROWS = 10
+
+class AnalysisEngine:
+    """
+    One grouped pass over the frame (per state, district, pincode and
+    date) shared by every prompt_list analysis. Coarser levels are
+    derived from that base table on first use, so running several
+    topics costs about one scan of the raw rows in total.
+
+    Also accepts the output of ``load_csv(stream=True)``, which is
+    already at the base grain. ``monthly`` may pass a precomputed
+    month x state rollup (``PartitionStore.monthly()``) for the
+    temporal and longitudinal topics.
+    """
+
+    def __init__(self, df, monthly=None):
+        keys = [k for k in ENGINE_KEYS if k in df.columns]
+        values = [c for c in ENGINE_VALUES if c in df.columns]
+
+        grouped = df.groupby(keys, observed=True, sort=False, dropna=False)
+        base = grouped[values].sum()
+        if "records" not in base.columns:
+            base["records"] = grouped.size()
+
+        base = base.reset_index()
+        if "Total_Aadhaar" not in base.columns:
+            base["Total_Aadhaar"] = base["demo_age_5_17"] + base["demo_age_17_"]
+
+        self.base = base
+        self.monthly = monthly
+
+    def _rollup(self, keys, source=None):
+        # rows with missing keys stay in every level so totals agree with
+        # by_month; the rankings drop the NaN labels
+        source = self.base if source is None else source
+        return (
+            source.groupby(keys, observed=True, sort=False, dropna=False)[ENGINE_VALUES]
+            .sum()
+            .reset_index()
+        )
+
+    @cached_property
+    def by_pincode(self):
+        return self._rollup(["state", "district", "pincode"])
+
+    @cached_property
+    def by_district(self):
+        return self._rollup(["state", "district"], self.by_pincode)
+
+    @cached_property
+    def by_state(self):
+        return self._rollup(["state"], self.by_district)
+
+    @cached_property
+    def by_month(self):
+        if self.monthly is not None:
+            return (
+                self.monthly.groupby("month", sort=True)[ENGINE_VALUES]
+                .sum()
+                .reset_index()
+            )
+        if "date" not in self.base.columns:
+            return None
+        dated = self.base.dropna(subset=["date"])
+        monthly = dated.groupby(dated["date"].dt.to_period("M"))[ENGINE_VALUES].sum()
+        monthly.index = monthly.index.astype(str)
+        return monthly.rename_axis("month").reset_index()
+
+def _as_engine(data):
+    return data if isinstance(data, AnalysisEngine) else AnalysisEngine(data)
+
+def _ranked(table, label_col, value_col, n=RESULT_ROWS, ascending=False):
+    return get_top_n(table, label_col, value_col, n, ascending)
+
+def _ranked_rows(table, label_col, value_col, n=RESULT_ROWS, ascending=False):
+    # One row per label already: rank as-is, never re-group (ratios must not be summed)
+    ranked = table.dropna(subset=[label_col]).sort_values([value_col, label_col], ascending=[ascending, True], kind="stable")
+    return ranked[[label_col, value_col]].head(n).reset_index(drop=True)
+
+def _district_labels(districts):
+    # District names repeat across states (Aurangabad, Bilaspur, ...)
+    districts = districts.copy()
+    known = districts["district"].notna() & districts["state"].notna()
+    labels = districts["district"].astype(str) + " (" + districts["state"].astype(str) + ")"
+    districts["district"] = labels.where(known)
+    return districts
+
+def _ratio(numerator, denominator):
+    return numerator / denominator.where(denominator != 0)
+
+def age_wise_coverage(data):
+    """States whose youth share deviates most from the national share."""
+    states = _as_engine(data).by_state.copy()
+    national = states["demo_age_5_17"].sum() / states["Total_Aadhaar"].sum()
+    share = _ratio(states["demo_age_5_17"], states["Total_Aadhaar"])
+    states["imbalance_pct_points"] = ((share - national).abs() * 100).round(2)
+    return _ranked(states.dropna(subset=["imbalance_pct_points"]), "state", "imbalance_pct_points")
+
+def youth_pressure(data):
+    """Districts carrying the most 5-17 enrolments."""
+    districts = _district_labels(_as_engine(data).by_district)
+    return _ranked_rows(districts, "district", "demo_age_5_17")
+
+def adult_enrollment_mapping(data):
+    """Adult (17+) share of each state's Aadhaar total."""
+    states = _as_engine(data).by_state.copy()
+    states["adult_share_pct"] = (_ratio(states["demo_age_17_"], states["Total_Aadhaar"]) * 100).round(2)
+    return _ranked(states.dropna(subset=["adult_share_pct"]), "state", "adult_share_pct")
+
+adult_saturation = adult_enrollment_mapping
+
+def temporal_growth(data):
+    """Monthly Aadhaar totals."""
+    monthly = _as_engine(data).by_month
+    if monthly is None:
+        return None
+    return monthly[["month", "Total_Aadhaar"]]
+
+def district_disparity(data):
+    """Coefficient of variation of district totals within each state."""
+    districts = _as_engine(data).by_district.dropna(subset=["district"])
+    spread = districts.groupby("state", observed=True)["Total_Aadhaar"].agg(["std", "mean"])
+    spread["district_cv"] = _ratio(spread["std"], spread["mean"]).round(3)
+    spread = spread.dropna(subset=["district_cv"]).reset_index()
+    return _ranked(spread, "state", "district_cv")
+
+def pincode_coverage(data):
+    """Pincodes with the lowest Aadhaar totals (coverage gaps)."""
+    return _ranked(_as_engine(data).by_pincode, "pincode", "Total_Aadhaar", ascending=True)
+
+def youth_adult_ratio(data):
+    """Districts with the highest youth-to-adult enrolment ratio."""
+    districts = _district_labels(_as_engine(data).by_district)
+    districts["youth_adult_ratio"] = _ratio(districts["demo_age_5_17"], districts["demo_age_17_"]).round(3)
+    return _ranked_rows(districts.dropna(subset=["youth_adult_ratio"]), "district", "youth_adult_ratio")
+
+def state_concentration(data):
+    """Each state's share of the national Aadhaar total."""
+    states = _as_engine(data).by_state.copy()
+    states["national_share_pct"] = (states["Total_Aadhaar"] / states["Total_Aadhaar"].sum() * 100).round(2)
+    return _ranked(states, "state", "national_share_pct")
+
+def longitudinal_stability(data):
+    """Month-over-month change in Aadhaar totals."""
+    monthly = _as_engine(data).by_month
+    if monthly is None or len(monthly) < 2:
+        return None
+    change = (monthly["Total_Aadhaar"].pct_change() * 100).round(2)
+    return pd.DataFrame({"month": monthly["month"], "mom_change_pct": change}).dropna()
+
+def resource_allocation(data):
+    """Districts with the most youth enrolments per pincode served."""
+    engine = _as_engine(data)
+    districts = engine.by_district.copy()
+    pincodes = (
+        engine.by_pincode.dropna(subset=["pincode"])
+        .groupby(["state", "district"], observed=True)
+        .size()
+    )
+    districts["pincodes"] = pincodes.reindex(
+        pd.MultiIndex.from_frame(districts[["state", "district"]])
+    ).to_numpy()
+    districts["youth_per_pincode"] = _ratio(districts["demo_age_5_17"], districts["pincodes"]).round(1)
+    districts = _district_labels(districts)
+    return _ranked_rows(districts.dropna(subset=["youth_per_pincode"]), "district", "youth_per_pincode")
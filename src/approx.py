@@ -0,0 +1,123 @@
+# src/approx.py
+
+import numpy as np
+import pandas as pd
+
+# 95% normal-approximation intervals
+Z_95 = 1.96
+
+
+# ------------------------------------------------------
+# STRATIFIED SAMPLE
+# ------------------------------------------------------
+class StratifiedSample:
+    """
+    Row sample stratified by ``strata`` (state by default): every
+    stratum keeps ``fraction`` of its rows but at least ``min_rows``,
+    so small states are not lost. Totals are estimated with the usual
+    stratified expansion estimator and its normal-approximation
+    confidence interval.
+    """
+
+    def __init__(self, df, strata="state", fraction=0.02, min_rows=200, seed=None):
+        rng = np.random.default_rng(seed)
+
+        codes, uniques = pd.factorize(df[strata], sort=False)
+        # rows without a stratum (NaN state) form one extra stratum
+        codes = np.where(codes < 0, len(uniques), codes)
+        population = np.bincount(codes)
+        rate = np.clip(min_rows / population, fraction, 1.0)
+
+        keep = np.flatnonzero(rng.random(len(df)) < rate[codes])
+        self.frame = df.iloc[keep].reset_index(drop=True)
+        self.rows = len(df)
+
+        self._stratum = codes[keep]
+        self._population = population.astype(np.float64)
+        self._sampled = np.bincount(self._stratum, minlength=len(population)).astype(np.float64)
+
+    def mask(self, states=None, districts=None, pincodes=None):
+        """
+        Domain (sidebar filter) mask over the sample rows.
+        """
+        mask = np.ones(len(self.frame), dtype=bool)
+        if states:
+            mask &= self.frame["state"].isin(states).to_numpy()
+        if districts:
+            mask &= self.frame["district"].isin(districts).to_numpy()
+        if pincodes:
+            mask &= self.frame["pincode"].astype(str).isin(pincodes).to_numpy()
+        return mask
+
+    def top_n(self, group_col, value_col, n=10, mask=None, z=Z_95, ascending=False):
+        """
+        Estimated top-``n`` (bottom with ``ascending``) groups by total
+        ``value_col`` with ``ci_low``/``ci_high`` columns. The first two
+        columns match ``get_top_n`` so the result can be charted the
+        same way.
+        """
+        y = self._values(value_col, mask)
+        groups, labels = pd.factorize(self.frame[group_col], sort=False)
+
+        if mask is not None:
+            # groups with no sampled row inside the domain are not estimated
+            present = np.bincount(groups[mask & (groups >= 0)], minlength=len(labels)) > 0
+        else:
+            present = np.ones(len(labels), dtype=bool)
+
+        estimate, variance = self._estimate(groups, y, len(labels))
+        half = z * np.sqrt(variance)
+
+        result = pd.DataFrame({
+            group_col: np.asarray(labels)[present],
+            value_col: np.round(estimate[present]).astype(np.int64),
+            "ci_low": np.round(np.maximum(estimate - half, 0)[present]).astype(np.int64),
+            "ci_high": np.round((estimate + half)[present]).astype(np.int64)
+        })
+        return result.sort_values(
+            [value_col, group_col], ascending=[ascending, True], kind="stable"
+        ).head(n).reset_index(drop=True)
+
+    # ------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------
+    def _values(self, value_col, mask):
+        if value_col is None:
+            y = np.ones(len(self.frame), dtype=np.float64)
+        else:
+            y = self.frame[value_col].to_numpy(dtype=np.float64)
+        if mask is not None:
+            y = np.where(mask, y, 0.0)
+        return y
+
+    def _estimate(self, groups, y, n_groups):
+        """
+        Per-group expansion totals and variances. For group g the
+        variable is y where the row is in g (and the domain), else 0;
+        its per-stratum sample variance only needs the sum and sum of
+        squares over the (stratum, group) cells that have rows.
+        """
+        # rows outside every group (NaN label) only count as zeros
+        rows = groups >= 0
+        groups, y = groups[rows], y[rows]
+
+        n_strata = len(self._population)
+        cell = groups.astype(np.int64) * n_strata + self._stratum[rows]
+        cells, inverse = np.unique(cell, return_inverse=True)
+
+        sums = np.bincount(inverse, weights=y, minlength=len(cells))
+        squares = np.bincount(inverse, weights=y * y, minlength=len(cells))
+        group = cells // n_strata
+        stratum = cells % n_strata
+
+        N = self._population[stratum]
+        n = self._sampled[stratum]
+
+        totals = np.bincount(group, weights=N / n * sums, minlength=n_groups)
+
+        sample_var = (squares - sums * sums / n) / np.maximum(n - 1, 1)
+        cell_var = N * N * (1 - n / N) / n * np.maximum(sample_var, 0)
+        variances = np.bincount(group, weights=cell_var, minlength=n_groups)
+
+        return totals, variances
+
@@ -0,0 +1,241 @@
+# src/batch.py
+#
+# Programmatic entry point for many queries at once.
+#
+#   from src.batch import run_queries
+#   results = run_queries(["top 5 adult districts in Bihar",
+#                          {"level": "state", "age_group": "youth", "top_n": 10}])
+#
+#   python -m src.batch queries.jsonl --out results.parquet
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.analyzer import get_top_n, AGE_VALUE_COLS
+from src.ai.response_cache import normalize_query
+from src.ai.schema import normalize_parsed as _normalize, query_filters
+from src.loader import DATA_FILES, load_frame
+from src.prompt_router import IntentRouter, LOCAL_CONFIDENCE
+from src.rollup import RollupCube
+
+# concurrent Gemini parse calls for queries the local router is unsure of
+LLM_WORKERS = 4
+
+
+def run_queries(queries, data_files=DATA_FILES, use_llm=True, llm_workers=LLM_WORKERS):
+    """
+    Answers a batch of queries. Each query is either natural language
+    or a dict in the parser schema (``src.ai.schema``); dicts may also
+    carry ``states`` / ``districts`` / ``pincodes`` filter lists.
+
+    Text queries are deduplicated and parsed locally first; only the
+    uncertain ones go to Gemini, at most ``llm_workers`` at a time.
+    Parsed queries are grouped by dataset, level, filters, age group
+    and direction: every group is one cube selection and one top-N pass at the
+    group's largest ``top_n``, sliced per query.
+
+    Returns one dict per input query, in input order.
+    """
+    start = time.perf_counter()
+    datasets = {}
+
+    def dataset(key):
+        if key not in datasets:
+            path = data_files.get(key, data_files["default"])
+            datasets[key] = RollupCube.from_frame(load_frame(path))
+        return datasets[key]
+
+    # ---------- PARSE ----------
+    # the router's place names come from the default cube, loaded only for text queries
+    parsed = _parse_all(queries, lambda: dataset("default"), use_llm, llm_workers)
+
+    # ---------- GROUP ----------
+    groups = {}
+    for i, (intent, _) in enumerate(parsed):
+        if intent is None:
+            continue
+        filters = query_filters(intent)
+        key = (intent["dataset"], intent["level"], filters, intent["age_group"], intent["ascending"])
+        groups.setdefault(key, []).append(i)
+
+    # ---------- ANALYSE ----------
+    answers = {}
+    for (dataset_key, level, filters, age_group, ascending), members in groups.items():
+        try:
+            cube_df = dataset(dataset_key).select(
+                level,
+                states=list(filters[0]),
+                districts=list(filters[1]),
+                pincodes=list(filters[2])
+            )
+            top = max(parsed[i][0]["top_n"] for i in members)
+            ranked = get_top_n(cube_df, level, AGE_VALUE_COLS[age_group], top, ascending)
+            for i in members:
+                answers[i] = (ranked.head(parsed[i][0]["top_n"]), None)
+        except Exception as e:
+            for i in members:
+                answers[i] = (None, str(e))
+
+    # ---------- COLLECT ----------
+    results = []
+    for i, query in enumerate(queries):
+        intent, parser = parsed[i]
+        result_df, error = answers.get(i, (None, parser if intent is None else None))
+        results.append({
+            "id": i,
+            "query": query,
+            "parser": None if intent is None else parser,
+            "parsed": intent,
+            "rows": [] if result_df is None else result_df.to_dict("records"),
+            "error": error
+        })
+
+    print(
+        f"Batch: {len(queries)} queries, {len(groups)} analysis groups, "
+        f"{time.perf_counter() - start:.2f}s",
+        file=sys.stderr
+    )
+    return results
+
+
+def to_frame(results):
+    """
+    Long-format table of ``run_queries`` output, one row per ranked
+    label; the layout written to Parquet.
+    """
+    records = []
+    for result in results:
+        intent = result["parsed"] or {}
+        query = result["query"]
+        for rank, row in enumerate(result["rows"], start=1):
+            label, value = list(row.values())[:2]
+            records.append({
+                "query_id": result["id"],
+                "query": query if isinstance(query, str) else json.dumps(query),
+                "dataset": intent.get("dataset"),
+                "level": intent.get("level"),
+                "age_group": intent.get("age_group"),
+                "rank": rank,
+                "label": str(label),
+                "value": int(value)
+            })
+
+    columns = ["query_id", "query", "dataset", "level", "age_group", "rank", "label", "value"]
+    return pd.DataFrame(records, columns=columns)
+
+
+def write_results(results, out_path):
+    """
+    ``.parquet`` writes ``to_frame(results)``; anything else is JSON.
+    """
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    if out_path.endswith(".parquet"):
+        to_frame(results).to_parquet(out_path, index=False)
+    else:
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, default=str)
+    return out_path
+
+
+def read_queries(path):
+    """
+    A JSON list, or one query per line where lines starting with ``{``
+    are structured queries.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+
+    queries = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            queries.append(json.loads(line) if line.startswith("{") else line)
+    return queries
+
+
+# ------------------------------------------------------
+# HELPERS
+# ------------------------------------------------------
+def _parse_all(queries, default_cube, use_llm, llm_workers):
+    """
+    (parsed, parser) per query; parsed is None with the error as
+    ``parser`` when a text query cannot be parsed at all.
+    ``default_cube()`` is only called when there are text queries.
+    """
+    # the same text (up to case/whitespace) is parsed once
+    texts = {}
+    for query in queries:
+        if isinstance(query, str):
+            texts.setdefault(normalize_query(query), query)
+
+    if texts:
+        cube = default_cube()
+        router = IntentRouter(
+            cube.tables["state"]["state"].unique(),
+            cube.tables["district"]["district"].unique()
+        )
+
+    local, uncertain = {}, []
+    for key, text in texts.items():
+        local[key] = router.parse(text)
+        if local[key][1] < LOCAL_CONFIDENCE:
+            uncertain.append(key)
+
+    remote = {}
+    if use_llm and uncertain:
+        from src.ai.gemini_parser import gemini_parse_prompt
+
+        with ThreadPoolExecutor(max_workers=llm_workers) as pool:
+            futures = {key: pool.submit(gemini_parse_prompt, texts[key]) for key in uncertain}
+            for key, future in futures.items():
+                try:
+                    remote[key] = future.result()
+                except Exception:
+                    pass
+
+    parsed = []
+    for query in queries:
+        if isinstance(query, dict):
+            try:
+                parsed.append((_normalize(dict(query)), "structured"))
+            except Exception as e:
+                parsed.append((None, f"invalid query: {e}"))
+            continue
+
+        key = normalize_query(query)
+        if key in remote:
+            parsed.append((dict(remote[key]), "gemini"))
+        else:
+            intent, confidence = local[key]
+            parser = "local" if confidence >= LOCAL_CONFIDENCE else "fallback"
+            parsed.append((dict(intent), parser))
+    return parsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a batch of Aadhaar analytics queries")
+    parser.add_argument("queries", help="JSON list, or one query per line ({...} lines are structured)")
+    parser.add_argument("--out", default=None, help="results .json or .parquet (default: JSON to stdout)")
+    parser.add_argument("--no-llm", action="store_true", help="local parser only, never call Gemini")
+    parser.add_argument("--llm-workers", type=int, default=LLM_WORKERS)
+    args = parser.parse_args()
+
+    results = run_queries(
+        read_queries(args.queries),
+        use_llm=not args.no_llm,
+        llm_workers=args.llm_workers
+    )
+
+    if args.out:
+        print(f"Wrote {len(results)} results to {write_results(results, args.out)}")
+    else:
+        print(json.dumps(results, indent=2, default=str))
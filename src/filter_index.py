@@ -0,0 +1,198 @@
+# src/filter_index.py
+
+import numpy as np
+import pandas as pd
+
+KEY_COLS = ["state", "district", "pincode"]
+VALUE_COL = "Total_Aadhaar"
+
+
+class FilterIndex:
+    """
+    Hierarchical state -> district -> pincode index over a frame sorted
+    by those keys.
+
+    Every (state, district, pincode) combination owns one contiguous
+    row range, so option lists and metric cards are assembled from the
+    selected ranges only instead of masking the full frame.
+    """
+
+    def __init__(self, df):
+        self.frame = df.sort_values(KEY_COLS, kind="stable").reset_index(drop=True)
+
+        # every run, including those with missing keys: a state or district
+        # filter still selects its rows whose district/pincode is missing
+        runs = self._runs(self.frame)
+        runs["pincode_str"] = runs["pincode"].astype(str)
+        runs["total"] = self._run_totals(self.frame, runs)
+        has_district = runs["district"].notna()
+        has_pincode = runs["pincode"].notna()
+
+        # metric cards for the unfiltered frame (includes rows with missing keys)
+        self._overall = {
+            "records": len(self.frame),
+            "total": int(self.frame[VALUE_COL].sum()),
+            "states": int(self.frame["state"].nunique()),
+            "districts": int(self.frame["district"].nunique())
+        }
+
+        self.states = sorted(runs["state"].dropna().unique())
+        self.all_districts = sorted(runs.loc[has_district, "district"].unique())
+        self.all_pincodes = sorted(runs.loc[has_pincode, "pincode_str"].unique())
+
+        self._state_ranges = {}
+        self._state_totals = {}
+        self._districts_by_state = {}
+        self._pincodes_by_state = {}
+        for state, group in runs.groupby("state", observed=True, sort=False):
+            self._state_ranges[state] = [(group["start"].iat[0], group["stop"].iat[-1])]
+            self._state_totals[state] = int(group["total"].sum())
+            self._districts_by_state[state] = sorted(group["district"].dropna().unique())
+            self._pincodes_by_state[state] = sorted(
+                group.loc[group["pincode"].notna(), "pincode_str"].unique()
+            )
+
+        self._district_ranges = {}
+        self._pincodes_by_district = {}
+        for (state, district), group in runs[has_district].groupby(
+            ["state", "district"], observed=True, sort=False, dropna=False
+        ):
+            state = None if pd.isna(state) else state
+            self._district_ranges.setdefault(district, []).append(
+                (state, group["start"].iat[0], group["stop"].iat[-1], int(group["total"].sum()))
+            )
+            self._pincodes_by_district.setdefault(district, []).append(
+                (state, group.loc[group["pincode"].notna(), "pincode_str"].tolist())
+            )
+
+        self._pincode_ranges = {}
+        for row in runs[has_pincode].itertuples(index=False):
+            self._pincode_ranges.setdefault(row.pincode_str, []).append((
+                None if pd.isna(row.state) else row.state,
+                None if pd.isna(row.district) else row.district,
+                row.start, row.stop, int(row.total)
+            ))
+
+    # ------------------------------------------------------
+    # OPTION LISTS
+    # ------------------------------------------------------
+    def districts(self, states=None):
+        if not states:
+            return self.all_districts
+
+        names = set()
+        for state in states:
+            names.update(self._districts_by_state.get(state, []))
+        return sorted(names)
+
+    def pincodes(self, states=None, districts=None):
+        if not districts:
+            if not states:
+                return self.all_pincodes
+
+            codes = set()
+            for state in states:
+                codes.update(self._pincodes_by_state.get(state, []))
+            return sorted(codes)
+
+        codes = set()
+        for district in districts:
+            for state, district_codes in self._pincodes_by_district.get(district, []):
+                if not states or state in states:
+                    codes.update(district_codes)
+        return sorted(codes)
+
+    # ------------------------------------------------------
+    # METRIC CARDS
+    # ------------------------------------------------------
+    def summary(self, states=None, districts=None, pincodes=None):
+        """
+        Records, Total_Aadhaar sum and distinct state/district counts of
+        the rows the sidebar filters select, merged from the per-run partials built at init
+        instead of scanning rows. Cost depends on the selection size,
+        not on the dataset size.
+        """
+        if not (states or districts or pincodes):
+            return dict(self._overall)
+
+        records = total = 0
+        state_names, district_names = set(), set()
+        for start, stop, part_total, state, districts in self._parts(states, districts, pincodes):
+            records += int(stop - start)
+            total += part_total
+            if state is not None:
+                state_names.add(state)
+            district_names.update(districts)
+
+        return {
+            "records": records,
+            "total": total,
+            "states": len(state_names),
+            "districts": len(district_names)
+        }
+
+    def _parts(self, states, districts, pincodes):
+        """
+        (start, stop, total, state, district names) for every contiguous
+        block the filters select; state is None for rows without one.
+        Same rows as chained ``isin`` masks on state, district and
+        ``pincode.astype(str)``, so missing keys only match unfiltered
+        levels.
+        """
+        states = set(states) if states else None
+        districts = set(districts) if districts else None
+
+        if pincodes:
+            return [
+                (start, stop, total, state, () if district is None else (district,))
+                for code in pincodes
+                for state, district, start, stop, total in self._pincode_ranges.get(code, [])
+                if (not states or state in states)
+                and (not districts or district in districts)
+            ]
+        if districts:
+            return [
+                (start, stop, total, state, (district,))
+                for district in districts
+                for state, start, stop, total in self._district_ranges.get(district, [])
+                if not states or state in states
+            ]
+        return [
+            (start, stop, self._state_totals[state], state, self._districts_by_state[state])
+            for state in states
+            for start, stop in self._state_ranges.get(state, [])
+        ]
+
+    # ------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------
+    @staticmethod
+    def _run_totals(frame, runs):
+        if runs.empty:
+            return np.zeros(0, dtype=np.int64)
+        values = frame[VALUE_COL].to_numpy(dtype=np.int64)
+        prefix = np.concatenate([[0], np.cumsum(values)])
+        return prefix[runs["stop"].to_numpy()] - prefix[runs["start"].to_numpy()]
+
+    @staticmethod
+    def _runs(frame):
+        """
+        One row per (state, district, pincode) run with its [start, stop)
+        offsets in the sorted frame; missing keys form runs of their own.
+        """
+        keys = frame[KEY_COLS]
+        if keys.empty:
+            return pd.DataFrame(columns=KEY_COLS + ["start", "stop"])
+
+        changed = np.zeros(len(keys), dtype=bool)
+        changed[0] = True
+        for col in KEY_COLS:
+            # factorize codes compare cleanly; every NaN shares code -1
+            codes, _ = pd.factorize(keys[col])
+            changed[1:] |= codes[1:] != codes[:-1]
+
+        starts = np.flatnonzero(changed)
+        runs = keys.iloc[starts].reset_index(drop=True)
+        runs["start"] = starts
+        runs["stop"] = np.append(starts[1:], len(keys))
+        return runs
@@ -0,0 +1,129 @@
+# src/ingest.py
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.loader import load_frame, CACHE_DIR
+
+# repo root, so ``python -m src.ingest`` resolves in the worker
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# status values reported per dataset
+PENDING = "pending"
+BUILDING = "building"
+READY = "ready"
+FAILED = "failed"
+
+
+def _convert(path, cache_dir):
+    # Each dataset is converted by its own ``python -m src.ingest``
+    # interpreter. A multiprocessing pool would re-import the parent's
+    # __main__, which under Streamlit is app.py itself. Only the row
+    # count comes back, never the frame.
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.ingest", os.path.abspath(path),
+         "--cache-dir", os.path.abspath(cache_dir)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exit code {proc.returncode}")
+    return int(proc.stdout.strip().splitlines()[-1])
+
+
+class IngestionManager:
+    """
+    Converts every configured dataset to the columnar cache in parallel
+    worker processes, so startup scales with cores instead of being serial.
+
+    ``status()`` reports per-file progress. A dataset is published
+    (status ``ready``) only after its cache file has been atomically
+    renamed into place, so readers never see a partial file.
+    """
+
+    def __init__(self, files, cache_dir=CACHE_DIR, max_workers=None):
+        self.files = dict(files)
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or min(len(self.files), os.cpu_count() or 1)
+        self._status = {key: {"state": PENDING} for key in self.files}
+        self._done = {key: threading.Event() for key in self.files}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def start(self):
+        """
+        Submits every dataset and returns immediately.
+        """
+        if self._pool is not None:
+            return self
+
+        # threads only wait on the worker subprocesses (no fork of the server)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="aadhaar-ingest"
+        )
+
+        for key, path in self.files.items():
+            self._update(key, state=BUILDING, started=time.time())
+            future = self._pool.submit(_convert, path, self.cache_dir)
+            future.add_done_callback(lambda f, key=key: self._finish(key, f))
+
+        return self
+
+    def status(self):
+        with self._lock:
+            return {key: dict(value) for key, value in self._status.items()}
+
+    def wait(self, key, timeout=None):
+        """
+        Blocks until ``key`` is published or failed; returns its status.
+        Unknown keys and a manager that was never started return at once.
+        """
+        if key in self._done and self._pool is not None:
+            self._done[key].wait(timeout)
+        return self.status().get(key)
+
+    def wait_path(self, path, timeout=None):
+        for key, file_path in self.files.items():
+            if file_path == path:
+                return self.wait(key, timeout)
+        return None
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------
+    def _update(self, key, **fields):
+        with self._lock:
+            self._status[key].update(fields)
+
+    def _finish(self, key, future):
+        started = self._status[key].get("started", time.time())
+        try:
+            rows = future.result()
+            self._update(key, state=READY, rows=rows, seconds=time.time() - started)
+        except Exception as e:
+            self._update(key, state=FAILED, error=str(e), seconds=time.time() - started)
+        finally:
+            self._done[key].set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the columnar cache for one CSV")
+    parser.add_argument("path")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    rows = len(load_frame(args.path, cache_dir=args.cache_dir))
+    # last stdout line is read back by IngestionManager
+    print(rows)
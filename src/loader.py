@@ -1,28 +1,390 @@
+import hashlib
+import json
+import os
+
+import numpy as np
 import pandas as pd
+import pyarrow.feather as feather
+
+from src.normalize import normalize_column
+
+# ------------------------------------------------------
+# COLUMNAR CACHE CONFIG
+# ------------------------------------------------------
+CACHE_DIR = os.path.join("data", "cache")
+CACHE_VERSION = 3
+
+# dataset key (parser schema "dataset") -> source CSV
+DATA_FILES = {
+    "default": "data/input/aadhar_clean.csv",
+    "biometric": "data/input/aadhar_biom.csv",
+    "enrolment": "data/input/aadhar_enroll.csv"
+}
+
+CATEGORY_COLS = ["state", "district"]
+AGE_COLS = ["demo_age_5_17", "demo_age_17_"]
+
+# candidate formats, day-first ones ahead of the rest (the data is dd-mm-yyyy)
+DATE_FORMATS = [
+    "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%d-%m-%y", "%d/%m/%y",
+    "%d-%b-%Y", "%d %b %Y", "%Y-%m-%d", "%Y/%m/%d", "%Y-%m-%d %H:%M:%S"
+]
+
+# group keys / value columns for the streaming aggregation mode
+STREAM_KEYS = ["state", "district", "pincode", "date"]
+STREAM_VALUES = AGE_COLS + ["Total_Aadhaar", "records"]
 
-def load_csv(path, use_chunks=False, chunksize=200000):
+# ------------------------------------------------------
+# PUBLIC FUNCTIONS
+# ------------------------------------------------------
+def load_csv(path, use_chunks=False, chunksize=200000, use_cache=True,
+             stream=False, keys=STREAM_KEYS):
     """
     Optimized CSV loader for Aadhaar demographic data.
+
+    With ``stream=True`` the raw rows are never held: each chunk is
+    folded into running sums per ``keys`` (see ``stream_aggregate``).
     """
     try:
-        if use_chunks:
+        if stream:
+            df = stream_aggregate(path, keys=keys, chunksize=chunksize)
+            if "date" not in df.columns:
+                return df
+        elif use_cache:
+            df = load_frame(path, chunksize=chunksize)
+        elif use_chunks:
             # Chunking useful for very large files to avoid memory crash
             reader = pd.read_csv(path, chunksize=chunksize, low_memory=False)
             chunks = []
+            dates = DateParser()
             for chunk in reader:
-                # Pre-processing dates within chunks is faster
-                chunk['date'] = pd.to_datetime(chunk['date'], dayfirst=True, errors='coerce')
+                # Format is detected on the first chunk and reused
+                chunk['date'] = dates(chunk['date'])
                 chunks.append(chunk)
             df = pd.concat(chunks, ignore_index=True)
+            dates.report(path)
         else:
             df = pd.read_csv(path, low_memory=False)
-            df['date'] = pd.to_datetime(df['date'], dayfirst=True, errors='coerce')
+            dates = DateParser()
+            df['date'] = dates(df['date'])
+            dates.report(path)
 
         # Drop rows where date is NaT to avoid analyzer errors
         df = df.dropna(subset=['date'])
-        
+
         return df
-        
+
     except FileNotFoundError:
         print(f"Error: File not found at {path}")
-        return None
\ No newline at end of file
+        return None
+
+
+def load_frame(path, cache_dir=CACHE_DIR, chunksize=200000):
+    """
+    Returns the cleaned, compactly typed frame for a source CSV.
+
+    The first call parses the CSV and writes an uncompressed Feather
+    file to ``cache_dir``; later calls memory-map that file instead of
+    re-parsing. The cache is rebuilt when the source mtime/size change
+    and its content hash no longer matches.
+    """
+    cache_path, meta_path = _cache_paths(path, cache_dir)
+
+    if _is_fresh(path, cache_path, meta_path):
+        return feather.read_feather(cache_path, memory_map=True)
+
+    df = _build_frame(path, chunksize)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # per-process temp name: ingestion workers may build concurrently
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        feather.write_feather(df, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+        _write_meta(path, meta_path)
+    except OSError as e:
+        print(f"Warning: could not write cache for {path}: {e}")
+
+    return df
+
+
+def dataset_fingerprint(path):
+    """
+    Cheap version tag for a source CSV (cache format + size + mtime).
+    It changes whenever ``load_frame`` would re-validate or rebuild the
+    columnar cache, so results keyed on it are dropped with the data.
+    """
+    stat = os.stat(path)
+    return f"v{CACHE_VERSION}-{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def stream_aggregate(path, keys=STREAM_KEYS, chunksize=200000):
+    """
+    Out-of-core aggregation: folds the CSV chunk by chunk into per-group
+    sums of the age columns, Total_Aadhaar and a ``records`` row count.
+
+    Per-chunk partials are collected and only re-grouped with the
+    running aggregate once they hold as many rows as it does, so each
+    row is folded a bounded number of times. Peak memory is one chunk
+    plus about twice the aggregate. The aggregate is only small when
+    ``keys`` leave out ``date`` and ``pincode`` (e.g. state/district);
+    with the default keys it grows with the data. The result uses the
+    raw column names, so the analyzer functions work on it directly.
+    """
+    return stream_rollups(path, [keys], chunksize=chunksize)[0]
+
+
+def stream_rollups(path, grains, chunksize=200000, dated_only=False):
+    """
+    ``stream_aggregate`` for several groupings in one pass over the CSV:
+    one aggregate per list of keys in ``grains``. ``month`` is accepted
+    as a key (``date`` as a monthly Period). ``dated_only`` drops rows
+    whose date did not parse, so every grain covers the same rows.
+    """
+    folds = [_RunningFold() for _ in grains]
+    dates = DateParser()
+    for chunk in pd.read_csv(path, chunksize=chunksize, low_memory=False):
+        chunk = _prepare_chunk(chunk, dates)
+        if dated_only and "date" in chunk.columns:
+            chunk = chunk[chunk["date"].notna()]
+        chunk["Total_Aadhaar"] = chunk["demo_age_5_17"] + chunk["demo_age_17_"]
+        chunk["records"] = 1
+        if "date" in chunk.columns and any("month" in keys for keys in grains):
+            chunk["month"] = chunk["date"].dt.to_period("M")
+
+        for fold, keys in zip(folds, grains):
+            fold.add(chunk, [k for k in keys if k in chunk.columns])
+
+    dates.report(path)
+    return [fold.result(keys) for fold, keys in zip(folds, grains)]
+
+
+class DateParser:
+    """
+    Fixed-format date parsing for the ``date`` column.
+
+    The format is detected once from a sample of distinct values and
+    reused for every later chunk. Only the distinct strings are parsed
+    (dates repeat heavily) and mapped back through their codes. Values
+    that do not match the format become NaT and are counted in
+    ``rejected`` instead of being guessed per element.
+    """
+
+    def __init__(self, date_format=None):
+        self.format = date_format
+        self.rejected = 0
+
+    def __call__(self, values):
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+
+        codes, uniques = pd.factorize(values)
+        uniques = pd.Series(uniques).astype(str)
+
+        if self.format is None:
+            self.format = detect_date_format(uniques)
+
+        if self.format is None:
+            parsed = pd.Series(pd.NaT, index=uniques.index, dtype="datetime64[ns]")
+        else:
+            parsed = pd.to_datetime(uniques, format=self.format, errors="coerce")
+
+        parsed = parsed.to_numpy()
+        result = np.full(len(codes), np.datetime64("NaT"), dtype=parsed.dtype)
+        present = codes >= 0
+        result[present] = parsed[codes[present]]
+
+        self.rejected += int(present.sum() - (~np.isnat(result)).sum())
+        return pd.Series(result, index=values.index, name=values.name)
+
+    def report(self, path):
+        if self.rejected:
+            print(
+                f"Warning: {self.rejected:,} rows in {path} did not match "
+                f"date format {self.format!r} and were set to NaT"
+            )
+
+
+def detect_date_format(values, sample_size=1000):
+    """
+    Picks the candidate format that parses the most sampled values.
+    """
+    sample = pd.Series(values).dropna().astype(str).head(sample_size)
+    if sample.empty:
+        return None
+
+    best, best_hits = None, 0
+    for fmt in DATE_FORMATS:
+        hits = pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum()
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+            if hits == len(sample):
+                break
+    return best
+
+
+# ------------------------------------------------------
+# HELPERS
+# ------------------------------------------------------
+class _RunningFold:
+    """
+    Running per-group sums for ``stream_rollups``: partials are kept
+    until they hold as many rows as the running aggregate, then merged.
+    """
+
+    def __init__(self):
+        self.running = None
+        self.keys = None
+        self.pending = []
+        self.pending_rows = 0
+
+    def add(self, chunk, keys):
+        self.keys = keys
+        part = _fold(chunk, keys)
+        self.pending.append(part)
+        self.pending_rows += len(part)
+
+        if self.running is None or self.pending_rows >= len(self.running):
+            self._merge()
+
+    def result(self, keys):
+        if self.pending:
+            self._merge()
+        if self.running is None:
+            return pd.DataFrame(columns=keys + STREAM_VALUES)
+        return self.running
+
+    def _merge(self):
+        frames = ([] if self.running is None else [self.running]) + self.pending
+        self.running = _fold(_concat_aligned(frames), self.keys)
+        self.pending, self.pending_rows = [], 0
+
+
+def _fold(frame, keys):
+    return (
+        frame.groupby(keys, observed=True, sort=False, dropna=False)[STREAM_VALUES]
+        .sum()
+        .reset_index()
+    )
+
+
+def _concat_aligned(frames):
+    # union the per-chunk categories so the keys stay categorical (not object)
+    for col in CATEGORY_COLS:
+        if col in frames[0].columns:
+            categories = sorted(set().union(*(f[col].cat.categories for f in frames)))
+            frames = [f.assign(**{col: f[col].cat.set_categories(categories)}) for f in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _prepare_chunk(chunk, dates):
+    chunk.columns = chunk.columns.str.strip()
+
+    if "date" in chunk.columns:
+        chunk["date"] = dates(chunk["date"])
+
+    # cleaned per distinct spelling, result is categorical
+    for col in CATEGORY_COLS:
+        if col in chunk.columns:
+            chunk[col] = normalize_column(chunk[col], col)
+
+    return chunk
+
+
+def _cache_paths(path, cache_dir):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    base = os.path.join(cache_dir, stem)
+    return base + ".feather", base + ".meta.json"
+
+
+def _file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_meta(path, file_hash=None):
+    stat = os.stat(path)
+    return {
+        "version": CACHE_VERSION,
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "sha1": file_hash or _file_hash(path)
+    }
+
+
+def _write_meta(path, meta_path, file_hash=None):
+    tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(_source_meta(path, file_hash), f)
+    os.replace(tmp_path, meta_path)
+
+
+def _is_fresh(path, cache_path, meta_path):
+    if not (os.path.exists(cache_path) and os.path.exists(meta_path)):
+        # Surface a missing source as FileNotFoundError, like read_csv
+        os.stat(path)
+        return False
+
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if meta.get("version") != CACHE_VERSION:
+        return False
+
+    stat = os.stat(path)
+    if meta.get("mtime") == stat.st_mtime and meta.get("size") == stat.st_size:
+        return True
+
+    # mtime changed (e.g. file touched or re-copied): fall back to content hash
+    if meta.get("size") != stat.st_size:
+        return False
+
+    file_hash = _file_hash(path)
+    if meta.get("sha1") != file_hash:
+        return False
+
+    _write_meta(path, meta_path, file_hash)
+    return True
+
+
+def _build_frame(path, chunksize):
+    chunks = []
+    dates = DateParser()
+    for chunk in pd.read_csv(path, chunksize=chunksize, low_memory=False):
+        chunks.append(_prepare_chunk(chunk, dates))
+    dates.report(path)
+
+    if not chunks:
+        return pd.read_csv(path)
+
+    # Align categories so concat keeps the categorical dtype
+    for col in CATEGORY_COLS:
+        if col in chunks[0].columns:
+            categories = sorted(set().union(*(c[col].cat.categories for c in chunks)))
+            for c in chunks:
+                c[col] = c[col].cat.set_categories(categories)
+
+    df = pd.concat(chunks, ignore_index=True)
+    return _compact_dtypes(df)
+
+
+def _compact_dtypes(df):
+    if "pincode" in df.columns:
+        pincode = pd.to_numeric(df["pincode"], errors="coerce")
+        df["pincode"] = pincode.astype("Int32" if pincode.isna().any() else "int32")
+
+    if all(col in df.columns for col in AGE_COLS):
+        # Sum before down-casting so the total cannot overflow a narrow dtype
+        df["Total_Aadhaar"] = df["demo_age_5_17"] + df["demo_age_17_"]
+
+    for col in AGE_COLS + ["Total_Aadhaar"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+
+    return df
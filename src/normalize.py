@@ -0,0 +1,104 @@
+# src/normalize.py
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ======================================================
+# ALIAS TABLES (lowercase, single-spaced key -> canonical)
+# ======================================================
+STATE_FIX_MAP = {
+    "west bengal": "West Bengal",
+    "west bangal": "West Bengal",
+    "west bengli": "West Bengal",
+    "westbengal": "West Bengal",
+
+    "andhra pradesh": "Andhra Pradesh",
+    "andhrapradesh": "Andhra Pradesh",
+
+    "odisha": "Odisha",
+    "orissa": "Odisha",
+
+    "chhattisgarh": "Chhattisgarh",
+    "chattisgarh": "Chhattisgarh",
+    "chhatishgarh": "Chhattisgarh",
+    "chhatisgarh": "Chhattisgarh",
+    "chatisgarh": "Chhattisgarh",
+
+    "uttaranchal": "Uttarakhand",
+    "pondicherry": "Puducherry",
+    "jammu & kashmir": "Jammu And Kashmir",
+    "andaman & nicobar islands": "Andaman And Nicobar Islands",
+    "dadra & nagar haveli": "Dadra And Nagar Haveli",
+    "daman & diu": "Daman And Diu",
+    "tamilnadu": "Tamil Nadu",
+    "telengana": "Telangana"
+}
+
+DISTRICT_FIX_MAP = {
+    "gurgaon": "Gurugram",
+    "mewat": "Nuh",
+    "allahabad": "Prayagraj",
+    "faizabad": "Ayodhya",
+    "hoshangabad": "Narmadapuram",
+    "bangalore": "Bengaluru",
+    "bangalore urban": "Bengaluru Urban",
+    "bangalore rural": "Bengaluru Rural",
+    "mysore": "Mysuru",
+    "belgaum": "Belagavi",
+    "gulbarga": "Kalaburagi",
+    "shimoga": "Shivamogga",
+    "east midnapore": "Purba Medinipur",
+    "east midnapur": "Purba Medinipur",
+    "west midnapore": "Paschim Medinipur",
+    "west midnapur": "Paschim Medinipur",
+    "north twenty four parganas": "North 24 Parganas",
+    "south twenty four parganas": "South 24 Parganas",
+    "ahmadabad": "Ahmedabad",
+    "ahmed nagar": "Ahmednagar",
+    "visakhapatanam": "Visakhapatnam"
+}
+
+ALIASES = {
+    "state": STATE_FIX_MAP,
+    "district": DISTRICT_FIX_MAP
+}
+
+
+# ======================================================
+# PUBLIC FUNCTIONS
+# ======================================================
+@lru_cache(maxsize=None)
+def clean_name(name, kind="state"):
+    if not isinstance(name, str):
+        return name
+    key = " ".join(name.lower().split())
+    return ALIASES[kind].get(key, " ".join(name.split()).title())
+
+
+def clean_state_name(state):
+    return clean_name(state, "state")
+
+
+def normalize_column(values, kind="state"):
+    """
+    Cleans a state/district column through its categorical codes, so
+    the alias lookup runs once per distinct spelling rather than once
+    per row. Returns a categorical with sorted, de-duplicated categories.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype("category")
+
+    cleaned = [clean_name(c, kind) for c in values.cat.categories]
+    categories = sorted(set(cleaned))
+
+    # old code -> new code; -1 (missing) stays -1
+    remap = np.append(pd.Index(categories).get_indexer(cleaned), -1)
+    codes = remap[values.cat.codes.to_numpy()]
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=values.index,
+        name=values.name
+    )
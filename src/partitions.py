@@ -0,0 +1,181 @@
+# src/partitions.py
+
+import json
+import os
+import sys
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from src.loader import stream_aggregate, _file_hash, STREAM_KEYS, STREAM_VALUES
+
+PARTITION_DIR = os.path.join("data", "partitions")
+
+
+class PartitionStore:
+    """
+    Date-partitioned store of base-grain sums (state, district, pincode,
+    date), one Feather file per day, plus a month x state rollup.
+
+    Appending a new extract only rewrites the days it contains and
+    recomputes the rollup rows of the months those days fall in.
+    """
+
+    def __init__(self, root=PARTITION_DIR):
+        self.root = root
+        self.rollup_path = os.path.join(root, "monthly.feather")
+        self.manifest_path = os.path.join(root, "manifest.json")
+
+    # ------------------------------------------------------
+    # WRITE
+    # ------------------------------------------------------
+    def append(self, path, chunksize=200000):
+        """
+        Adds a CSV extract. Returns the list of affected days; a file
+        that was already appended (same content hash) is skipped.
+        """
+        manifest = self._manifest()
+        file_hash = _file_hash(path)
+        if file_hash in manifest["files"]:
+            print(f"Skipping {path}: already appended")
+            return []
+
+        extract = stream_aggregate(path, keys=STREAM_KEYS, chunksize=chunksize)
+        dropped = int(extract.loc[extract["date"].isna(), "records"].sum())
+        extract = extract.dropna(subset=["date"])
+
+        os.makedirs(self.root, exist_ok=True)
+
+        days = []
+        if extract.empty:
+            # nothing to partition; still recorded so the file is not re-read
+            print(f"Warning: {path} has no rows with a valid date")
+        else:
+            for day, rows in extract.groupby(extract["date"].dt.normalize()):
+                self._merge_day(day, rows)
+                days.append(day)
+
+            self._refresh_months({day.strftime("%Y-%m") for day in days})
+
+        manifest["files"][file_hash] = {
+            "path": os.path.abspath(path),
+            "days": len(days),
+            "rows": int(extract["records"].sum()),
+            "dropped_rows": dropped
+        }
+        self._write_json(self.manifest_path, manifest)
+
+        return days
+
+    # ------------------------------------------------------
+    # READ
+    # ------------------------------------------------------
+    def days(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            pd.Timestamp(name[len("date="):-len(".feather")])
+            for name in os.listdir(self.root)
+            if name.startswith("date=") and name.endswith(".feather")
+        )
+
+    def read(self, start=None, end=None):
+        """
+        Base-grain rows for the days in [start, end].
+        """
+        days = [
+            d for d in self.days()
+            if (start is None or d >= pd.Timestamp(start))
+            and (end is None or d <= pd.Timestamp(end))
+        ]
+        if not days:
+            return pd.DataFrame(columns=STREAM_KEYS + STREAM_VALUES)
+
+        frame = pd.concat([self._read_day(d) for d in days], ignore_index=True)
+        for col in ["state", "district"]:
+            frame[col] = frame[col].astype("category")
+        return frame
+
+    def monthly(self):
+        """
+        Month x state sums (``month`` as YYYY-MM), or None when empty.
+        """
+        if not os.path.exists(self.rollup_path):
+            return None
+        return feather.read_feather(self.rollup_path)
+
+    # ------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------
+    def _day_path(self, day):
+        return os.path.join(self.root, f"date={day.strftime('%Y-%m-%d')}.feather")
+
+    def _read_day(self, day):
+        frame = feather.read_feather(self._day_path(day))
+        for col in ["state", "district"]:
+            frame[col] = frame[col].astype(object)
+        return frame
+
+    def _merge_day(self, day, rows):
+        rows = rows.copy()
+        for col in ["state", "district"]:
+            rows[col] = rows[col].astype(object)
+
+        if os.path.exists(self._day_path(day)):
+            rows = (
+                pd.concat([self._read_day(day), rows], ignore_index=True)
+                .groupby(STREAM_KEYS, sort=False, dropna=False)[STREAM_VALUES]
+                .sum()
+                .reset_index()
+            )
+
+        self._write_frame(self._day_path(day), rows.reset_index(drop=True))
+
+    def _refresh_months(self, months):
+        fresh = []
+        for month in sorted(months):
+            period = pd.Period(month, "M")
+            rows = self.read(period.start_time, period.end_time)
+            fresh.append(
+                rows.groupby("state", observed=True)[STREAM_VALUES]
+                .sum()
+                .reset_index()
+                .assign(month=month)
+            )
+
+        monthly = self.monthly()
+        if monthly is not None:
+            monthly = monthly[~monthly["month"].isin(months)]
+            fresh.insert(0, monthly)
+
+        combined = pd.concat(fresh, ignore_index=True)
+        combined["state"] = combined["state"].astype(object)
+        combined = combined.sort_values(["month", "state"]).reset_index(drop=True)
+        self._write_frame(self.rollup_path, combined[["month", "state"] + STREAM_VALUES])
+
+    def _manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {"files": {}}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_frame(path, frame):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        feather.write_feather(frame, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _write_json(path, payload):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    # python -m src.partitions data/input/drop_2025_01_15.csv [...]
+    store = PartitionStore()
+    for extract_path in sys.argv[1:]:
+        affected = store.append(extract_path)
+        print(f"{extract_path}: {len(affected)} day partition(s) updated")
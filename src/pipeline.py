@@ -0,0 +1,88 @@
+# src/pipeline.py
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Shared by every session: work here is mostly network-bound (Gemini)
+# or releases the GIL inside pandas/numpy
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="aadhaar-pipeline")
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    """
+    Runs ``fn`` on the shared pool.
+
+    The caller's Streamlit script context and contextvars are attached
+    to the worker so cached functions and tracing behave as they do on
+    the script thread.
+    UI calls should still be made from the script thread only.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    # carries the active query trace (src.tracing) into the worker
+    context = contextvars.copy_context()
+
+    def run():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return context.run(fn, *args, **kwargs)
+
+    return _executor.submit(run)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls: the first caller for a key
+    runs ``fn``, everyone arriving while it is in flight waits for and
+    shares its result (or exception). Nothing is kept afterwards; the
+    response cache and st.cache_* handle repeats over time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.joined = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = Future()
+                self.leaders += 1
+                leader = True
+            else:
+                self.joined += 1
+                leader = False
+
+        if not leader:
+            return call.result()
+
+        try:
+            call.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            call.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return call.result()
+
+
+# one per process, shared by all sessions
+single_flight = SingleFlight()
+
+
+def guess_dataset(user_query: str) -> str:
+    """
+    Same keyword rules the Gemini parser is given, used to start loading
+    the likely dataset while the parse is still in flight.
+    """
+    q = user_query.lower()
+    if "biometric" in q:
+        return "biometric"
+    if "enrol" in q:
+        return "enrolment"
+    return "default"
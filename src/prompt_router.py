@@ -1,6 +1,11 @@
 # src/prompt_router.py
 
+import difflib
 import re
+from collections import deque
+
+from src.ai.schema import normalize_parsed, DEFAULT_TOP_N, MAX_TOP_N
+from src.normalize import STATE_FIX_MAP, DISTRICT_FIX_MAP
 
 def route_prompt(user_prompt: str):
     p = user_prompt.lower()
@@ -28,3 +33,301 @@ def route_prompt(user_prompt: str):
         result["topic"] = "total"
 
     return result
+
+
+# ======================================================
+# PROMPT LIST TOPICS (main.py)
+# ======================================================
+TOPIC_KEYWORDS = {
+    "Age-wise Aadhaar Coverage Imbalance": ["age-wise", "age wise", "imbalance", "age group"],
+    "Regional Youth Population Pressure": ["youth", "pressure", "child"],
+    "Adult Enrollment Saturation Mapping": ["adult", "saturation"],
+    "Temporal Growth Pattern Analysis": ["growth", "trend", "temporal", "over time", "monthly"],
+    "District-Level Demographic Disparity": ["disparity", "inequality", "district"],
+    "Pincode-Level Coverage Gaps": ["pincode", "pin code", "gap"],
+    "Youth-to-Adult Ratio Risk Zones": ["ratio", "risk"],
+    "State-wise Demographic Concentration": ["concentration", "share", "state-wise", "statewise"],
+    "Longitudinal Stability Assessment": ["stability", "stable", "longitudinal", "volatil"],
+    "Resource Allocation Optimization": ["resource", "allocation", "centre", "center", "optimi"]
+}
+
+def route_topics(user_prompt: str):
+    """
+    Maps a query to the prompt_list.txt topics it mentions, in list order.
+    """
+    p = user_prompt.lower().strip()
+
+    # an exact topic title (e.g. a prompt_list.txt line) maps to itself only
+    for topic in TOPIC_KEYWORDS:
+        if p == topic.lower():
+            return [topic]
+
+    return [
+        topic for topic, words in TOPIC_KEYWORDS.items()
+        if any(w in p for w in words)
+    ]
+
+
+# ======================================================
+# LOCAL INTENT ROUTER
+# ======================================================
+# Below this the query goes to Gemini
+LOCAL_CONFIDENCE = 0.8
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "fifteen": 15, "twenty": 20
+}
+
+ADULT_WORDS = {"adult", "adults", "17+", "18+", "above"}
+YOUTH_WORDS = {"youth", "youths", "child", "children", "kids", "young", "5-17", "minor", "minors"}
+DISTRICT_WORDS = {"district", "districts"}
+STATE_WORDS = {"state", "states", "statewise", "state-wise"}
+
+# rank from the bottom (schema "ascending")
+ASCENDING_WORDS = {"bottom", "lowest", "least", "fewest", "smallest", "minimum", "min", "worst"}
+
+# the schema holds one state and one ranking; these always go to Gemini
+COMPARE_WORDS = {"compare", "comparison", "compared", "versus", "vs", "between", "difference"}
+
+# an unrecognised word of this length or more may change the meaning
+CONTENT_WORD_LEN = 3
+
+# Words that carry no intent of their own in templated queries
+FILLER_WORDS = {
+    "top", "the", "in", "of", "for", "with", "by", "and", "a", "an", "to", "on",
+    "show", "list", "give", "me", "which", "what", "are", "is", "get", "find",
+    "highest", "most", "largest", "biggest", "best", "leading", "max", "maximum",
+    "aadhaar", "aadhar", "uid", "population", "coverage", "count", "counts",
+    "number", "numbers", "total", "overall", "all", "data", "wise", "age",
+    "group", "groups", "enrolment", "enrolments", "enrollment", "enrollments",
+    "enrolled", "saturation", "biometric", "biometrics", "update", "updates",
+    "analysis", "chart", "graph", "plot", "ranking", "rank", "ranked",
+    "17", "5", "year", "years", "old", "india", "indian"
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9+\-]+")
+
+
+class _AhoCorasick:
+    """
+    Minimal Aho-Corasick automaton over lowercase name strings.
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+        for pattern in patterns:
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(pattern)
+
+        # root children keep fail = 0; fill the rest breadth first
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text):
+        """
+        Yields (start, end, pattern) for every occurrence in text.
+        """
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for pattern in self.out[node]:
+                yield i - len(pattern) + 1, i + 1, pattern
+
+
+class IntentRouter:
+    """
+    Local parser for templated queries ("top 5 adult districts in Bihar").
+
+    Returns the same schema as ``gemini_parse_prompt`` plus a confidence
+    score; callers should only fall back to Gemini when it is low.
+    """
+
+    def __init__(self, states=(), districts=()):
+        # lowercase surface form -> (kind, canonical name)
+        self.names = {}
+        for district in districts:
+            if isinstance(district, str):
+                self.names[district.strip().lower()] = ("district", district)
+        for state in states:
+            if isinstance(state, str):
+                self.names[state.strip().lower()] = ("state", state)
+        for alias, district in DISTRICT_FIX_MAP.items():
+            self.names[alias] = ("district", district)
+        for alias, state in STATE_FIX_MAP.items():
+            self.names[alias] = ("state", state)
+
+        self._automaton = _AhoCorasick(self.names)
+        self._fuzzy_keys = {}
+        for key in self.names:
+            self._fuzzy_keys.setdefault(len(key.split()), []).append(key)
+
+    def parse(self, user_prompt: str):
+        p = user_prompt.lower()
+        tokens = [(m.start(), m.end(), m.group()) for m in TOKEN_RE.finditer(p)]
+        known = [False] * len(tokens)
+        penalty = 1.0
+
+        # -------- NAMES (exact, then fuzzy) --------
+        matches = self._exact_names(p)
+        for start, end, _ in matches:
+            for i, (t_start, t_end, _) in enumerate(tokens):
+                if t_start >= start and t_end <= end:
+                    known[i] = True
+
+        if not matches:
+            fuzzy = self._fuzzy_names(tokens, known)
+            if fuzzy:
+                matches = fuzzy
+                penalty = 0.9
+
+        state = next((n for _, _, (k, n) in matches if k == "state"), None)
+        district = next((n for _, _, (k, n) in matches if k == "district"), None)
+
+        words = [t for _, _, t in tokens]
+
+        # -------- TOP N --------
+        top_n = None
+        for i, word in enumerate(words):
+            value = int(word) if word.isdigit() else NUMBER_WORDS.get(word)
+            if value is None:
+                continue
+            prev_word = words[i - 1] if i else ""
+            next_word = words[i + 1] if i + 1 < len(words) else ""
+            if prev_word == "top" or next_word in DISTRICT_WORDS | STATE_WORDS:
+                top_n = value
+                known[i] = True
+                break
+
+        # -------- KEYWORDS --------
+        age_group = "total"
+        level = "district" if district else "state"
+        ascending = False
+        for i, word in enumerate(words):
+            if word in ASCENDING_WORDS:
+                ascending = True
+            elif word in ADULT_WORDS:
+                age_group = "adult"
+            elif word in YOUTH_WORDS:
+                age_group = "youth"
+            elif word in DISTRICT_WORDS:
+                level = "district"
+            elif word in STATE_WORDS:
+                pass
+            elif word not in FILLER_WORDS and word not in NUMBER_WORDS:
+                continue
+            known[i] = True
+
+        dataset = "default"
+        analysis_type = "enrolment"
+        if "biometric" in p:
+            dataset = analysis_type = "biometric"
+        elif "enrol" in p:
+            dataset = "enrolment"
+        if "saturation" in p:
+            analysis_type = "saturation"
+
+        parsed = normalize_parsed({
+            "dataset": dataset,
+            "level": level,
+            "state": state,
+            "age_group": age_group,
+            "top_n": top_n if top_n is not None else DEFAULT_TOP_N,
+            "ascending": ascending,
+            "analysis_type": analysis_type
+        })
+        parsed["graph_title"] = _title(parsed["top_n"], age_group, parsed["level"], state, ascending)
+        if district:
+            parsed["district"] = district
+
+        confidence = (sum(known) / len(tokens) if tokens else 0.0) * penalty
+        if top_n is not None and top_n > MAX_TOP_N:
+            confidence = 0.0
+
+        # comparisons and several places cannot be expressed locally
+        names = {n for _, _, (_, n) in matches}
+        if len(names) > 1 or any(w in COMPARE_WORDS for w in words):
+            confidence = 0.0
+
+        # "adult and youth" names two age groups; only one fits the schema
+        if ADULT_WORDS & set(words) and YOUTH_WORDS & set(words):
+            confidence = min(confidence, LOCAL_CONFIDENCE / 2)
+
+        # an unknown content word can reverse the query; never answer it locally
+        if any(not k and len(w) >= CONTENT_WORD_LEN and not w.isdigit()
+               for k, w in zip(known, words)):
+            confidence = min(confidence, LOCAL_CONFIDENCE / 2)
+
+        return parsed, confidence
+
+    # ------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------
+    def _exact_names(self, text):
+        found = []
+        for start, end, pattern in self._automaton.find(text):
+            before = text[start - 1] if start else " "
+            after = text[end] if end < len(text) else " "
+            if before.isalnum() or after.isalnum():
+                continue
+            found.append((start, end, self.names[pattern]))
+
+        # keep the longest match wherever matches overlap
+        found.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        kept = []
+        for match in found:
+            if kept and match[0] < kept[-1][1]:
+                if match[1] - match[0] > kept[-1][1] - kept[-1][0]:
+                    kept[-1] = match
+                continue
+            kept.append(match)
+        return kept
+
+    def _fuzzy_names(self, tokens, known):
+        found = []
+        for size in sorted(self._fuzzy_keys, reverse=True):
+            for i in range(len(tokens) - size + 1):
+                if any(known[i:i + size]):
+                    continue
+                words = [t for _, _, t in tokens[i:i + size]]
+                if size == 1 and (words[0] in FILLER_WORDS or len(words[0]) < 4):
+                    continue
+                close = difflib.get_close_matches(
+                    " ".join(words), self._fuzzy_keys[size], n=1, cutoff=0.85
+                )
+                if close:
+                    found.append((tokens[i][0], tokens[i + size - 1][1], self.names[close[0]]))
+                    for j in range(i, i + size):
+                        known[j] = True
+        return found
+
+
+def _title(top_n, age_group, level, state, ascending=False):
+    label = {"adult": "Adult", "youth": "Youth", "total": "Total"}[age_group]
+    title = f"{'Bottom' if ascending else 'Top'} {top_n} {level.title()}s by {label} Aadhaar"
+    if state:
+        title += f" in {state}"
+    return title
@@ -0,0 +1,69 @@
+# src/result_cache.py
+
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Size-bounded in-process LRU for analysis results.
+
+    Keys should start with the dataset fingerprint
+    (``src.loader.dataset_fingerprint``) so a rebuilt dataset never
+    serves old results; its stale entries simply age out.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, fn, *args, **kwargs):
+        """
+        Returns ``(value, hit)``; on a miss ``fn(*args, **kwargs)`` is
+        computed outside the lock and stored.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value, True
+
+        value = fn(*args, **kwargs)
+        self.set(key, value)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,71 @@
+# src/rollup.py
+
+VALUE_COLS = ["demo_age_5_17", "demo_age_17_", "Total_Aadhaar"]
+
+# finest -> coarsest
+LEVEL_KEYS = {
+    "pincode": ["state", "district", "pincode"],
+    "district": ["state", "district"],
+    "state": ["state"]
+}
+
+LEVEL_ORDER = ["state", "district", "pincode"]
+
+
+class RollupCube:
+    """
+    Pre-aggregated sums of the age columns at the pincode -> district ->
+    state levels.
+
+    Built once per dataset; queries then touch only the grouped tables,
+    so their cost depends on the number of groups, not raw rows.
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    @classmethod
+    def from_frame(cls, df):
+        value_cols = [c for c in VALUE_COLS if c in df.columns]
+
+        tables = {}
+        source = df
+        for level in ["pincode", "district", "state"]:
+            keys = LEVEL_KEYS[level]
+            # rows with a missing pincode/district still count at coarser levels
+            tables[level] = (
+                source.groupby(keys, observed=True, sort=False, dropna=False)[value_cols]
+                .sum()
+                .reset_index()
+            )
+            # coarser levels roll up from the previous (smaller) table
+            source = tables[level]
+
+        return cls(tables)
+
+    def select(self, level="state", states=None, districts=None, pincodes=None):
+        """
+        Returns the smallest pre-aggregated table that can answer a
+        ``level`` query under the given sidebar filters. The result has
+        the same column names as the raw frame, so the analyzer
+        functions work on it unchanged.
+        """
+        needed = [level]
+        if districts:
+            needed.append("district")
+        if pincodes:
+            needed.append("pincode")
+
+        finest = max(needed, key=LEVEL_ORDER.index)
+        table = self.tables[finest]
+
+        if states:
+            table = table[table["state"].isin(states)]
+
+        if districts:
+            table = table[table["district"].isin(districts)]
+
+        if pincodes:
+            table = table[table["pincode"].astype(str).isin(pincodes)]
+
+        return table
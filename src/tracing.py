@@ -0,0 +1,138 @@
+# src/tracing.py
+
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+# JSONL sink: one line per finished query trace (unset = no file output)
+TRACE_LOG = os.getenv("AADHAAR_TRACE_LOG")
+
+_current = contextvars.ContextVar("aadhaar_trace", default=None)
+
+
+class Trace:
+    """
+    Span timings for one dashboard query.
+
+    Spans are attached to whichever trace is active in the current
+    context; ``src.pipeline.submit`` copies the context into worker
+    threads, so background stages land on the same trace.
+    """
+
+    def __init__(self, name, profile=False):
+        # profile: False, True/"cprofile", or "pyinstrument"
+        self.name = name
+        self.spans = []
+        self.profile_text = None
+        self._profile = profile
+        self._profiler = None
+        self._lock = threading.Lock()
+        self._token = None
+        self._start = None
+        self._total_ms = None
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._token = _current.set(self)
+
+        if self._profile == "pyinstrument":
+            # optional dependency; fall back to cProfile when missing
+            try:
+                from pyinstrument import Profiler
+                self._profiler = Profiler()
+                self._profiler.start()
+                return self
+            except ImportError:
+                pass
+
+        if self._profile:
+            # cProfile only sees the calling (script) thread
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def finish(self):
+        if isinstance(self._profiler, cProfile.Profile):
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(30)
+            self.profile_text = out.getvalue()
+        elif self._profiler is not None:
+            self._profiler.stop()
+            self.profile_text = self._profiler.output_text()
+        self._profiler = None
+
+        self._total_ms = round((time.perf_counter() - self._start) * 1e3, 3)
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+
+        if TRACE_LOG:
+            _write_jsonl(TRACE_LOG, self.to_dict())
+        return self
+
+    def add(self, record):
+        with self._lock:
+            self.spans.append(record)
+
+    def to_dict(self):
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "query": self.name,
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_ms": self._total_ms,
+            "spans": spans
+        }
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    Times a stage. The yielded dict can be filled in by the caller
+    (rows_in, rows_out, cache_hit, ...). Outside an active trace it is
+    timed and then dropped.
+    """
+    record = {"name": name, **attrs}
+    trace = _current.get()
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record["ms"] = round((time.perf_counter() - start) * 1e3, 3)
+        if trace is not None:
+            trace.add(record)
+
+
+def record_llm_usage(record, response):
+    """
+    Copies token counts from a genai response onto a span record.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    record["prompt_tokens"] = getattr(usage, "prompt_token_count", None)
+    record["output_tokens"] = getattr(usage, "candidates_token_count", None)
+    record["total_tokens"] = getattr(usage, "total_token_count", None)
+
+
+def current_trace():
+    return _current.get()
+
+
+def _write_jsonl(path, payload):
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, default=str) + "\n")
+    except OSError as e:
+        print(f"Warning: could not write trace to {path}: {e}")
@@ -1,13 +1,102 @@
 # src/visualizer.py
 
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+# "matplotlib" (PNG, cached) or "vega" (native Streamlit chart, no rasterizing)
+CHART_BACKEND = os.getenv("CHART_BACKEND", "matplotlib")
+
+# headless exports (main.py)
+GRAPH_DIR = os.path.join("data", "output", "graphs")
+
+# rendered PNGs kept per process, keyed on (data, graph_type, title)
+RENDER_CACHE_SIZE = 64
+
+_render_cache = OrderedDict()
+_render_lock = threading.Lock()
+
+BG_COLOR = "#0b0f19"     # dark bg
+BAR_COLOR = "#4f7cff"    # primary blue
+EDGE_COLOR = "#9b5cff"
+TEXT_COLOR = "#e5e7eb"
+TICK_COLOR = "#9ca3af"
+
+
+def generate_graph(df, graph_type, title, backend=None):
+    backend = backend or CHART_BACKEND
+
+    # ---------- STREAMLIT RENDER ----------
+    if backend == "vega":
+        st.vega_lite_chart(
+            df,
+            _vega_spec(df, graph_type, title),
+            width="stretch",
+            theme=None
+        )
+    else:
+        st.image(render_png(df, graph_type, title), width="stretch")
+
+
+def render_png(df, graph_type, title, fmt="png"):
+    """
+    Rendered chart bytes, served from a small LRU cache when the same
+    result, graph type and title were drawn before.
+    """
+    key = _chart_key(df, graph_type, title, fmt)
+
+    with _render_lock:
+        if key in _render_cache:
+            _render_cache.move_to_end(key)
+            return _render_cache[key]
+
+    fig = render_figure(df, graph_type, title)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, facecolor=fig.get_facecolor(), dpi=110)
+    data = buffer.getvalue()
+
+    with _render_lock:
+        _render_cache[key] = data
+        while len(_render_cache) > RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+
+    return data
+
 
-def generate_graph(df, graph_type, title):
+def save_graph(df, graph_type, title, out_dir=GRAPH_DIR, formats=("png",)):
+    """
+    Writes the chart to ``out_dir/<slug>.<fmt>`` for each format and
+    returns the paths. Needs no Streamlit runtime or display.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    slug = re.sub(r"[^a-z0-9\-]+", "_", title.lower()).strip("_")
+
+    paths = []
+    for fmt in formats:
+        path = os.path.join(out_dir, f"{slug}.{fmt}")
+        with open(path, "wb") as f:
+            f.write(render_png(df, graph_type, title, fmt=fmt))
+        paths.append(path)
+    return paths
+
+
+def render_figure(df, graph_type, title):
+    """
+    Builds the chart on a standalone Figure (not pyplot), so nothing is
+    registered globally and it is freed as soon as it goes out of scope.
+    """
     # ---------- FIG SETUP ----------
-    fig, ax = plt.subplots(figsize=(9, 4))
-    fig.patch.set_facecolor("#0b0f19")   # dark bg
-    ax.set_facecolor("#0b0f19")
+    fig = Figure(figsize=(9, 4), layout="constrained")
+    ax = fig.subplots()
+    fig.patch.set_facecolor(BG_COLOR)
+    ax.set_facecolor(BG_COLOR)
 
     x = df.iloc[:, 0].astype(str)
     y = df.iloc[:, 1]
@@ -17,35 +106,43 @@ def generate_graph(df, graph_type, title):
         bars = ax.bar(
             x,
             y,
-            color="#4f7cff",     # primary blue
-            edgecolor="#9b5cff",
+            color=BAR_COLOR,
+            edgecolor=EDGE_COLOR,
             linewidth=0.6
         )
 
         # value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2,
-                height,
-                f"{int(height):,}",
-                ha="center",
-                va="bottom",
-                fontsize=9,
-                color="#e5e7eb"
-            )
+        ax.bar_label(
+            bars,
+            labels=[_format_value(v) for v in y],
+            fontsize=9,
+            color=TEXT_COLOR
+        )
+
+    # ---------- LINE GRAPH ----------
+    elif graph_type == "line":
+        ax.plot(
+            x,
+            y,
+            color=BAR_COLOR,
+            linewidth=2,
+            marker="o",
+            markersize=4,
+            markerfacecolor=EDGE_COLOR,
+            markeredgecolor=EDGE_COLOR
+        )
 
     # ---------- TITLE ----------
     ax.set_title(
         title,
         fontsize=14,
-        color="#e5e7eb",
+        color=TEXT_COLOR,
         pad=15
     )
 
     # ---------- AXIS STYLING ----------
-    ax.tick_params(axis="x", colors="#9ca3af", rotation=45)
-    ax.tick_params(axis="y", colors="#9ca3af")
+    ax.tick_params(axis="x", colors=TICK_COLOR, rotation=45)
+    ax.tick_params(axis="y", colors=TICK_COLOR)
 
     for spine in ax.spines.values():
         spine.set_visible(False)
@@ -57,7 +154,58 @@ def generate_graph(df, graph_type, title):
         alpha=0.3
     )
 
-    plt.tight_layout()
+    return fig
 
-    # ---------- STREAMLIT RENDER ----------
-    st.pyplot(fig, use_container_width=True)
+
+# ------------------------------------------------------
+# HELPERS
+# ------------------------------------------------------
+def _format_value(value):
+    if float(value).is_integer():
+        return f"{int(value):,}"
+    return f"{value:,.2f}"
+
+
+def _chart_key(df, graph_type, title, fmt):
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(repr((list(df.columns), graph_type, title, fmt)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _vega_spec(df, graph_type, title):
+    x_col, y_col = str(df.columns[0]), str(df.columns[1])
+
+    encoding = {
+        "x": {
+            "field": x_col,
+            "type": "ordinal" if graph_type == "line" else "nominal",
+            "sort": None,
+            "axis": {"labelAngle": -45, "labelColor": TICK_COLOR, "title": None}
+        },
+        "y": {
+            "field": y_col,
+            "type": "quantitative",
+            "axis": {"labelColor": TICK_COLOR, "gridOpacity": 0.3, "gridDash": [4, 4]}
+        },
+        "tooltip": [{"field": x_col}, {"field": y_col, "format": ","}]
+    }
+
+    if graph_type == "line":
+        layers = [{"mark": {"type": "line", "point": True, "color": BAR_COLOR}}]
+    else:
+        layers = [
+            {"mark": {"type": "bar", "color": BAR_COLOR, "stroke": EDGE_COLOR, "strokeWidth": 0.6}},
+            {
+                "mark": {"type": "text", "dy": -6, "color": TEXT_COLOR, "fontSize": 11},
+                "encoding": {"text": {"field": y_col, "type": "quantitative", "format": ","}}
+            }
+        ]
+
+    return {
+        "title": {"text": title, "color": TEXT_COLOR},
+        "background": BG_COLOR,
+        "encoding": encoding,
+        "layer": layers,
+        "config": {"view": {"stroke": None}}
+    }
@@ -0,0 +1,75 @@
+# tests/test_analyzer.py
+
+import pandas as pd
+
+from src.analyzer import (
+    AnalysisEngine, youth_adult_ratio, resource_allocation, youth_pressure,
+    state_concentration, temporal_growth, district_disparity
+)
+
+
+def _frame():
+    # two different districts share the name "Aurangabad"
+    df = pd.DataFrame({
+        "state": ["Bihar", "Maharashtra", "Bihar"],
+        "district": ["Aurangabad", "Aurangabad", "Patna"],
+        "pincode": [824101, 431001, 800001],
+        "date": pd.to_datetime(["2025-01-01"] * 3),
+        "demo_age_5_17": [5, 5, 1],
+        "demo_age_17_": [10, 10, 10]
+    })
+    df["Total_Aadhaar"] = df["demo_age_5_17"] + df["demo_age_17_"]
+    return df
+
+
+def test_district_ratios_are_not_summed_across_states():
+    result = youth_adult_ratio(_frame()).set_index("district")["youth_adult_ratio"]
+    assert result["Aurangabad (Bihar)"] == 0.5
+    assert result["Aurangabad (Maharashtra)"] == 0.5
+
+    per_pincode = resource_allocation(_frame()).set_index("district")["youth_per_pincode"]
+    assert per_pincode["Aurangabad (Bihar)"] == 5.0
+
+
+def test_district_labels_include_state():
+    assert set(youth_pressure(_frame())["district"]) == {
+        "Aurangabad (Bihar)", "Aurangabad (Maharashtra)", "Patna (Bihar)"
+    }
+
+
+def _frame_with_missing_keys():
+    df = _frame()
+    extra = pd.DataFrame({
+        "state": ["Bihar", "Bihar"],
+        "district": ["Patna", None],
+        "pincode": pd.array([pd.NA, 800002], dtype="Int32"),
+        "date": pd.to_datetime(["2025-02-01"] * 2),
+        "demo_age_5_17": [2, 3],
+        "demo_age_17_": [20, 30]
+    })
+    extra["Total_Aadhaar"] = extra["demo_age_5_17"] + extra["demo_age_17_"]
+    df["pincode"] = df["pincode"].astype("Int32")
+    return pd.concat([df, extra], ignore_index=True)
+
+
+def test_rows_with_missing_keys_keep_level_totals_consistent():
+    df = _frame_with_missing_keys()
+    engine = AnalysisEngine(df)
+
+    for table in (engine.by_pincode, engine.by_district, engine.by_state):
+        assert table["Total_Aadhaar"].sum() == df["Total_Aadhaar"].sum()
+    assert temporal_growth(engine)["Total_Aadhaar"].sum() == df["Total_Aadhaar"].sum()
+    assert engine.by_state.set_index("state")["Total_Aadhaar"]["Bihar"] == 81
+    assert state_concentration(engine)["national_share_pct"].sum() == 100
+
+
+def test_rankings_skip_missing_labels():
+    engine = AnalysisEngine(_frame_with_missing_keys())
+
+    for result in (youth_pressure(engine), youth_adult_ratio(engine), resource_allocation(engine)):
+        assert result["district"].notna().all()
+        assert not any(label.startswith("nan") for label in result["district"])
+    assert district_disparity(engine)["state"].notna().all()
+    # Patna's NaN-pincode row counts in its total but not as a pincode served
+    per_pincode = resource_allocation(engine).set_index("district")["youth_per_pincode"]
+    assert per_pincode["Patna (Bihar)"] == 3.0
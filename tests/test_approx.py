@@ -0,0 +1,21 @@
+# tests/test_approx.py
+
+import numpy as np
+import pandas as pd
+
+from src.approx import StratifiedSample
+
+
+def test_rows_without_state_are_sampled():
+    df = pd.DataFrame({
+        "state": ["Bihar"] * 500 + [np.nan] * 300 + ["Kerala"] * 200,
+        "demo_age_5_17": 1
+    })
+    sample = StratifiedSample(df, fraction=1.0, seed=0)
+
+    assert len(sample.frame) == len(df)
+    top = sample.top_n("state", "demo_age_5_17", n=5)
+    assert top.set_index("state")["demo_age_5_17"].to_dict() == {"Bihar": 500, "Kerala": 200}
+
+    kerala = sample.top_n("state", "demo_age_5_17", mask=sample.mask(states=["Kerala"]))
+    assert kerala["state"].tolist() == ["Kerala"]
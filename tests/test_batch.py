@@ -0,0 +1,26 @@
+# tests/test_batch.py
+
+import pandas as pd
+
+from src.batch import run_queries
+
+
+def test_structured_queries_do_not_load_the_default_dataset(tmp_path):
+    path = tmp_path / "biometric.csv"
+    pd.DataFrame({
+        "date": ["01-03-2025"] * 3,
+        "state": ["Bihar", "Kerala", "Goa"],
+        "district": ["Patna", "Ernakulam", "North Goa"],
+        "pincode": [800001, 682001, 403001],
+        "demo_age_5_17": [5, 9, 1],
+        "demo_age_17_": [10, 10, 10]
+    }).to_csv(path, index=False)
+
+    # a default dataset that cannot be loaded: any access would fail the query
+    files = {"default": str(tmp_path / "missing.csv"), "biometric": str(path)}
+    query = {"dataset": "biometric", "level": "state", "age_group": "youth", "top_n": 2}
+
+    [result] = run_queries([query], data_files=files, use_llm=False)
+
+    assert result["error"] is None
+    assert [row["state"] for row in result["rows"]] == ["Kerala", "Bihar"]
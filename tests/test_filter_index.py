@@ -0,0 +1,74 @@
+# tests/test_filter_index.py
+
+import numpy as np
+import pandas as pd
+
+from src.filter_index import FilterIndex
+
+
+def _frame(rng, rows=400, missing=0.1):
+    states = rng.choice(["Bihar", "Goa", "Kerala", "Punjab"], rows).astype(object)
+    districts = np.array([f"D{i}" for i in rng.integers(0, 6, rows)], dtype=object)
+    pincodes = pd.array(rng.integers(100, 130, rows), dtype="Int32")
+
+    for values in (states, districts):
+        values[rng.random(rows) < missing] = None
+    pincodes[rng.random(rows) < missing] = pd.NA
+
+    return pd.DataFrame({
+        "state": pd.Categorical(states),
+        "district": pd.Categorical(districts),
+        "pincode": pincodes,
+        "Total_Aadhaar": rng.integers(0, 1000, rows)
+    }).sample(frac=1, random_state=int(rng.integers(1 << 30))).reset_index(drop=True)
+
+
+def _expected(df, states, districts, pincodes):
+    mask = np.ones(len(df), dtype=bool)
+    if states:
+        mask &= df["state"].isin(states).to_numpy()
+    if districts:
+        mask &= df["district"].isin(districts).to_numpy()
+    if pincodes:
+        mask &= df["pincode"].astype(str).isin(pincodes).to_numpy()
+    rows = df[mask]
+    return {
+        "records": len(rows),
+        "total": int(rows["Total_Aadhaar"].sum()),
+        "states": int(rows["state"].nunique()),
+        "districts": int(rows["district"].nunique())
+    }
+
+
+def _pick(rng, values, most=3):
+    return list(rng.choice(values, int(rng.integers(0, most + 1)), replace=False))
+
+
+def test_summary_matches_row_masks_on_random_filters():
+    rng = np.random.default_rng(7)
+    checked = 0
+    for missing in (0.0, 0.1, 0.4):
+        df = _frame(rng, missing=missing)
+        index = FilterIndex(df)
+
+        for _ in range(100):
+            states = _pick(rng, index.states + ["Nowhere"])
+            districts = _pick(rng, index.all_districts)
+            pincodes = _pick(rng, index.all_pincodes)
+
+            assert index.summary(states, districts, pincodes) == _expected(
+                df, states, districts, pincodes
+            ), (missing, states, districts, pincodes)
+            checked += 1
+    assert checked == 300
+
+
+def test_option_lists_skip_missing_keys():
+    df = _frame(np.random.default_rng(3), missing=0.3)
+    index = FilterIndex(df)
+
+    assert index.states == sorted(df["state"].dropna().unique())
+    for state in index.states:
+        rows = df[df["state"] == state]
+        assert index.districts([state]) == sorted(rows["district"].dropna().unique())
+        assert index.pincodes([state]) == sorted(rows["pincode"].dropna().astype(str).unique())
@@ -0,0 +1,48 @@
+# tests/test_ingest.py
+
+import os
+import subprocess
+import sys
+import textwrap
+
+from benchmarks.synthetic import write_csv
+from src.ingest import IngestionManager, READY, FAILED
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_datasets_reach_ready(tmp_path):
+    files = {
+        "default": write_csv(str(tmp_path / "a.csv"), 2000, seed=1),
+        "biometric": write_csv(str(tmp_path / "b.csv"), 1000, seed=2),
+        "enrolment": str(tmp_path / "missing.csv")
+    }
+    manager = IngestionManager(files, cache_dir=str(tmp_path / "cache")).start()
+
+    for key in files:
+        manager.wait(key, timeout=120)
+    status = manager.status()
+
+    assert status["default"]["state"] == READY
+    assert status["default"]["rows"] == 2000
+    assert status["biometric"]["state"] == READY
+    assert status["enrolment"]["state"] == FAILED
+
+
+def test_main_module_without_guard(tmp_path):
+    # Streamlit runs app.py as __main__ with no ``if __name__`` guard;
+    # the workers must not re-import it
+    csv_path = write_csv(str(tmp_path / "a.csv"), 500, seed=3)
+    script = tmp_path / "app_like.py"
+    script.write_text(textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {ROOT!r})
+        from src.ingest import IngestionManager
+        manager = IngestionManager({{"default": {csv_path!r}}}, cache_dir={str(tmp_path / "cache")!r})
+        print(manager.start().wait("default", timeout=120)["state"])
+    """))
+
+    proc = subprocess.run(
+        [sys.executable, str(script)], capture_output=True, text=True, timeout=180
+    )
+    assert proc.stdout.strip().splitlines()[-1] == READY, proc.stderr
@@ -0,0 +1,53 @@
+# tests/test_loader.py
+
+import numpy as np
+import pandas as pd
+
+from src.loader import stream_aggregate, stream_rollups
+
+
+def _write_csv(tmp_path, n=5000):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "date": rng.choice(["01-03-2025", "15-04-2025", "30-05-2025"], n),
+        "state": rng.choice(["Bihar", "Kerala", "Goa"], n),
+        "district": rng.choice(["Patna", "Gaya", "Ernakulam"], n),
+        "pincode": rng.integers(100000, 100050, n),
+        "demo_age_5_17": rng.integers(0, 10, n),
+        "demo_age_17_": rng.integers(0, 10, n)
+    })
+    path = tmp_path / "demo.csv"
+    df.to_csv(path, index=False)
+    return df, path
+
+
+def test_stream_aggregate_matches_one_pass_groupby(tmp_path):
+    df, path = _write_csv(tmp_path)
+    n = len(df)
+
+    keys = ["state", "district", "pincode"]
+    streamed = stream_aggregate(str(path), keys=keys, chunksize=300)
+    streamed = streamed.astype({"state": object, "district": object}).set_index(keys).sort_index()
+
+    expected = df.groupby(keys)[["demo_age_5_17", "demo_age_17_"]].sum().sort_index()
+    assert len(streamed) == len(expected)
+    assert (streamed[["demo_age_5_17", "demo_age_17_"]] == expected).all().all()
+    assert streamed["records"].sum() == n
+
+
+def test_stream_rollups_builds_every_grain_in_one_pass(tmp_path):
+    df, path = _write_csv(tmp_path)
+    df["month"] = pd.to_datetime(df["date"], format="%d-%m-%Y").dt.to_period("M")
+
+    pincodes, months = stream_rollups(
+        str(path), [["state", "district", "pincode"], ["state", "month"]], chunksize=300
+    )
+
+    assert isinstance(pincodes["state"].dtype, pd.CategoricalDtype)
+    assert isinstance(pincodes["district"].dtype, pd.CategoricalDtype)
+    assert len(pincodes) == len(df.groupby(["state", "district", "pincode"]))
+
+    months = months.astype({"state": object}).set_index(["state", "month"]).sort_index()
+    expected = df.groupby(["state", "month"])["demo_age_17_"].sum().sort_index()
+    assert (months["demo_age_17_"] == expected).all()
+    assert months["records"].sum() == len(df)
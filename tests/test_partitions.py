@@ -0,0 +1,36 @@
+# tests/test_partitions.py
+
+import json
+
+from src.partitions import PartitionStore
+
+HEADER = "date,state,district,pincode,demo_age_5_17,demo_age_17_\n"
+
+
+def test_extracts_without_valid_dates_are_recorded(tmp_path):
+    store = PartitionStore(str(tmp_path / "partitions"))
+    bad = tmp_path / "bad.csv"
+    bad.write_text(HEADER + "2025/13/45,Bihar,Patna,800001,1,2\n")
+    empty = tmp_path / "empty.csv"
+    empty.write_text(HEADER)
+
+    assert store.append(str(bad)) == []
+    assert store.append(str(empty)) == []
+    assert store.monthly() is None
+
+    with open(store.manifest_path) as f:
+        files = json.load(f)["files"].values()
+    assert sorted((e["days"], e["rows"], e["dropped_rows"]) for e in files) == [(0, 0, 0), (0, 0, 1)]
+
+    # a second append of the same file is skipped
+    assert store.append(str(bad)) == []
+
+
+def test_append_then_read(tmp_path):
+    store = PartitionStore(str(tmp_path / "partitions"))
+    good = tmp_path / "good.csv"
+    good.write_text(HEADER + "01-03-2025,Bihar,Patna,800001,1,2\n02-04-2025,Goa,North Goa,403001,3,4\n")
+
+    assert len(store.append(str(good))) == 2
+    assert store.read()["demo_age_17_"].sum() == 6
+    assert sorted(store.monthly()["month"]) == ["2025-03", "2025-04"]
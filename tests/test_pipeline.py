@@ -0,0 +1,118 @@
+# tests/test_pipeline.py
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.ai.client import StubBackend, set_backend, _stub_reply
+from src.ai.gemini_insight import generate_ai_insight
+from src.ai.gemini_parser import gemini_parse_prompt
+from src.ai.response_cache import response_cache
+from src.pipeline import submit, SingleFlight, single_flight
+
+DELAY = 0.3
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    # fresh on-disk response cache, slow deterministic model
+    monkeypatch.setattr(response_cache, "path", str(tmp_path / "responses.sqlite"))
+    monkeypatch.setattr(response_cache, "_ready", False)
+
+    release = threading.Event()
+    release.set()
+
+    def slow_reply(prompt):
+        release.wait(5)
+        time.sleep(DELAY)
+        return _stub_reply(prompt)
+
+    stub = StubBackend(slow_reply)
+    stub.release = release
+    set_backend(stub)
+    yield stub
+    set_backend(None)
+
+
+def _wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+def test_parse_overlaps_dataset_warmup(backend):
+    spans = {}
+
+    def warm(name):
+        start = time.perf_counter()
+        time.sleep(DELAY)
+        spans[name] = (start, time.perf_counter())
+        return name
+
+    def parse(query):
+        start = time.perf_counter()
+        parsed = gemini_parse_prompt(query)
+        spans["parse"] = (start, time.perf_counter())
+        return parsed
+
+    start = time.perf_counter()
+    parse_future = submit(parse, "top 3 youth states")
+    warm_future = submit(warm, "warm")
+    parsed = parse_future.result()
+    assert warm_future.result() == "warm"
+    elapsed = time.perf_counter() - start
+
+    assert parsed["level"] == "state" and parsed["top_n"] == 3
+    assert spans["parse"][0] < spans["warm"][1] and spans["warm"][0] < spans["parse"][1]
+    assert elapsed < 2 * DELAY
+
+
+def test_identical_parses_share_one_model_call(backend):
+    backend.release.clear()
+    joined = single_flight.joined
+
+    futures = [submit(gemini_parse_prompt, "top 7 adult districts in bihar") for _ in range(4)]
+    _wait_for(lambda: single_flight.joined - joined == 3)
+    backend.release.set()
+
+    results = [f.result() for f in futures]
+    assert backend.calls == 1
+    assert all(r == results[0] for r in results)
+    assert results[0]["top_n"] == 7
+
+
+def test_followers_get_the_leaders_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("boom")
+
+    futures = [submit(flight.do, "key", fail) for _ in range(3)]
+    _wait_for(lambda: flight.leaders == 1 and flight.joined == 2)
+    release.set()
+
+    errors = []
+    for future in futures:
+        with pytest.raises(ValueError) as info:
+            future.result()
+        errors.append(info.value)
+    assert all(e is errors[0] for e in errors)
+
+
+def test_parse_then_insight_uses_the_backend_once(backend):
+    parsed = submit(gemini_parse_prompt, "top 2 states").result()
+    result_df = pd.DataFrame({"state": ["Bihar", "Kerala"], "Total_Aadhaar": [10, 5]})
+    context = {"query": "top 2 states", "graph_title": parsed["graph_title"]}
+
+    first = submit(generate_ai_insight, result_df, context=context).result()
+    again = generate_ai_insight(result_df, context=context)
+
+    assert first.startswith("Solution:")
+    assert again == first
+    assert backend.calls == 2
@@ -0,0 +1,30 @@
+# tests/test_prompt_router.py
+
+from src.prompt_router import IntentRouter, LOCAL_CONFIDENCE
+
+ROUTER = IntentRouter(["Bihar", "Kerala", "Tamil Nadu", "Uttar Pradesh"], ["Patna"])
+
+
+def test_templated_query_is_local():
+    parsed, confidence = ROUTER.parse("top 5 adult districts in Bihar")
+    assert confidence >= LOCAL_CONFIDENCE
+    assert parsed["level"] == "district"
+    assert parsed["state"] == "Bihar"
+    assert parsed["ascending"] is False
+
+
+def test_direction_words_rank_from_the_bottom():
+    for query in ["bottom 5 states by youth",
+                  "top 10 districts in bihar with lowest adult aadhaar"]:
+        parsed, confidence = ROUTER.parse(query)
+        assert parsed["ascending"] is True
+        assert parsed["graph_title"].startswith("Bottom")
+
+
+def test_comparisons_and_unknown_words_go_to_gemini():
+    for query in ["compare kerala and tamil nadu youth",
+                  "kerala vs tamil nadu",
+                  "top 5 states excluding bihar",
+                  "top 5 states by adult and youth"]:
+        _, confidence = ROUTER.parse(query)
+        assert confidence < LOCAL_CONFIDENCE, query
@@ -0,0 +1,34 @@
+# tests/test_resilience.py
+
+import time
+
+import pytest
+
+from src.ai.resilience import call_with_retry
+
+
+def _failing(attempts, seconds=0.0):
+    def fn():
+        attempts.append(time.monotonic())
+        time.sleep(seconds)
+        raise TimeoutError("read timed out")
+    return fn
+
+
+def test_fast_transient_errors_are_retried():
+    attempts = []
+    with pytest.raises(TimeoutError):
+        call_with_retry(_failing(attempts), deadline=5, retries=2, base_delay=0.01,
+                        attempt_timeout=0.1)
+    assert len(attempts) == 3
+
+
+def test_no_retry_when_a_full_attempt_no_longer_fits():
+    attempts = []
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        # first attempt uses its whole timeout; a second would overrun the deadline
+        call_with_retry(_failing(attempts, 0.3), deadline=0.5, retries=2, base_delay=0.01,
+                        attempt_timeout=0.3)
+    assert len(attempts) == 1
+    assert time.monotonic() - start < 0.5
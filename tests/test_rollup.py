@@ -0,0 +1,25 @@
+# tests/test_rollup.py
+
+import pandas as pd
+
+from src.analyzer import total_analysis
+from src.rollup import RollupCube
+
+
+def test_rows_with_missing_keys_count_at_coarser_levels():
+    df = pd.DataFrame({
+        "state": ["A", "A", "A", "B"],
+        "district": ["D1", "D1", None, "D2"],
+        "pincode": pd.array([1, pd.NA, 2, 3], dtype="Int32"),
+        "demo_age_5_17": [1, 2, 4, 8],
+        "demo_age_17_": [10, 20, 40, 80]
+    })
+    df["Total_Aadhaar"] = df["demo_age_5_17"] + df["demo_age_17_"]
+    cube = RollupCube.from_frame(df)
+
+    for level in ("state", "district"):
+        expected = total_analysis(df, level, 10)
+        actual = total_analysis(cube.select(level), level, 10)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    assert cube.select("state").set_index("state")["Total_Aadhaar"]["A"] == 77
@@ -0,0 +1,16 @@
+# tests/test_schema.py
+
+from src.ai.schema import normalize_parsed, query_filters
+
+
+def test_query_place_is_merged_into_the_filters():
+    parsed = normalize_parsed({"level": "district", "state": "bihar", "district": "Patna"})
+
+    assert query_filters(parsed) == (("Bihar",), ("Patna",), ())
+    assert query_filters(parsed, ["Kerala", "Bihar"], [], [800001]) == (
+        ("Bihar", "Kerala"), ("Patna",), ("800001",)
+    )
+
+
+def test_no_place_means_no_filter():
+    assert query_filters(normalize_parsed({})) == ((), (), ())
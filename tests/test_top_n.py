@@ -0,0 +1,59 @@
+# tests/test_top_n.py
+
+import numpy as np
+import pandas as pd
+
+from src.analyzer import get_top_n, _select_n
+
+
+def _sorted_top_n(values, labels, n, ascending):
+    # full sort on (value, label): the order _select_n must reproduce
+    order = np.lexsort((labels, values if ascending else -values))
+    return order[:max(n, 0)]
+
+
+def test_select_n_matches_full_sort_on_random_inputs():
+    rng = np.random.default_rng(11)
+    for _ in range(3000):
+        size = int(rng.integers(0, 30))
+        # small value range so ties are common
+        values = rng.integers(0, 6, size).astype(np.int64)
+        labels = rng.permutation(np.array([f"L{i:02d}" for i in range(size)], dtype=object))
+        n = int(rng.integers(0, size + 5))
+        ascending = bool(rng.integers(0, 2))
+
+        expected = _sorted_top_n(values, labels, n, ascending)
+        actual = _select_n(values, labels, n, ascending)
+        assert actual.tolist() == expected.tolist(), (values, labels, n, ascending)
+
+
+def test_get_top_n_matches_sort_based_version():
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        rows = int(rng.integers(1, 60))
+        df = pd.DataFrame({
+            "district": rng.choice([f"D{i}" for i in range(12)], rows),
+            "Total_Aadhaar": rng.integers(0, 4, rows)
+        })
+        n = int(rng.integers(0, 15))
+        ascending = bool(rng.integers(0, 2))
+
+        expected = (
+            df.groupby("district")["Total_Aadhaar"].sum().reset_index()
+            .sort_values(["Total_Aadhaar", "district"], ascending=[ascending, True], kind="stable")
+            .head(n)
+            .reset_index(drop=True)
+        )
+        pd.testing.assert_frame_equal(
+            get_top_n(df, "district", "Total_Aadhaar", n, ascending), expected
+        )
+
+
+def test_edge_sizes():
+    values = np.array([3, 1, 3, 2])
+    labels = np.array(["b", "a", "a", "c"], dtype=object)
+
+    assert _select_n(values, labels, 0).tolist() == []
+    assert _select_n(values, labels, 10).tolist() == [2, 0, 3, 1]
+    assert _select_n(values, labels, 1, ascending=True).tolist() == [1]
+    assert _select_n(values[:0], labels[:0], 3).tolist() == []